@@ -34,6 +34,7 @@ setup(
         "sqs": ["boto3"],
         "rabbitmq": ["pika>=1.0"],
         "redis": ["redis>=4.0"],
+        "orjson": ["orjson>=3.0"],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
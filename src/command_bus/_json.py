@@ -0,0 +1,64 @@
+"""JSON encoding for the file-backed adapters and response stores: orjson when installed, stdlib json otherwise."""
+
+import json
+import math
+from typing import Any, Callable
+
+
+def _default(obj: Any) -> Any:
+    """Encode Pydantic models (e.g. handler results) as their JSON-mode dump."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _stdlib_dumps(obj: Any, default: Callable[[Any], Any] = _default) -> bytes:
+    """Encode obj as compact UTF-8 JSON with the stdlib encoder."""
+    return json.dumps(obj, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether obj holds a NaN or infinite float, which orjson would write as null."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+
+try:
+    import orjson
+
+    # Stringify int/float dict keys like the stdlib encoder does
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any, default: Callable[[Any], Any] = _default) -> bytes:
+        """Encode obj as compact UTF-8 JSON.
+
+        Values orjson cannot encode the way stdlib json does (ints wider than
+        64 bits, NaN and infinity) go through the stdlib encoder instead.
+        """
+        try:
+            data = orjson.dumps(obj, default=default, option=_OPTIONS)
+        except TypeError:
+            return _stdlib_dumps(obj, default)
+        # orjson writes NaN/inf as null; only look for them when a null was written
+        if b"null" in data and _has_non_finite(obj):
+            return _stdlib_dumps(obj, default)
+        return data
+
+    def loads(data: Any) -> Any:
+        """Decode JSON, falling back to stdlib json for the NaN/Infinity literals it writes."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+except ImportError:
+    dumps = _stdlib_dumps
+    loads = json.loads
+
+# orjson.JSONDecodeError subclasses it, so this catches either decoder's errors
+JSONDecodeError = json.JSONDecodeError
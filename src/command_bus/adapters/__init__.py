@@ -1,30 +1,18 @@
 """Queue and response adapters for the command bus."""
 
-from .queue import FileQueueAdapter, InMemoryCommandBusAdapter, SqsCommandBusAdapter
-
-__all__ = ["InMemoryCommandBusAdapter", "SqsCommandBusAdapter", "FileQueueAdapter"]
-
-try:
-    from .queue import RabbitMqCommandBusAdapter
+from typing import Any
 
-    __all__ += ["RabbitMqCommandBusAdapter"]
-except ImportError:
-    pass
-
-try:
-    from .queue import RedisCommandBusAdapter
-
-    __all__ += ["RedisCommandBusAdapter"]
-except ImportError:
-    pass
+from . import queue, response
+from .queue import FileQueueAdapter, InMemoryCommandBusAdapter, SqsCommandBusAdapter
+from .response import FileResponseStore, InMemoryResponseStore, SqliteResponseStore
 
-from .response import FileResponseStore, InMemoryResponseStore
+__all__ = queue.__all__ + response.__all__
 
-__all__ += ["InMemoryResponseStore", "FileResponseStore"]
+# Optional adapters resolve lazily through their subpackage's __getattr__
+_LAZY = {name: package for package in (queue, response) for name in package._LAZY}
 
-try:
-    from .response import RedisResponseStore
 
-    __all__ += ["RedisResponseStore"]
-except ImportError:
-    pass
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        return getattr(_LAZY[name], name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,50 @@
+"""Helpers shared by the file-backed adapters."""
+
+import mmap
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Tuple
+
+# Unread log tails at least this large are mmapped rather than read()
+MMAP_THRESHOLD = 64 * 1024
+
+
+@lru_cache(maxsize=1)
+def default_storage_dir() -> Path:
+    """Return ~/.qubot, creating it on first use; later calls skip the lookup and mkdir."""
+    storage_dir = Path.home() / ".qubot"
+    storage_dir.mkdir(exist_ok=True)
+    return storage_dir
+
+
+@contextmanager
+def read_tail(f: BinaryIO, offset: int, size: int) -> Iterator[Tuple[Any, int]]:
+    """
+    Yield (buf, base) holding the bytes of f from offset up to size; buf[0] is
+    at file offset base.
+
+    Large tails (e.g. a full replay) are mmapped instead of copied. Reads use
+    pread, so a handle shared across calls (or a fork) keeps no file position.
+    """
+    if size - offset >= MMAP_THRESHOLD:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm, 0
+    else:
+        yield os.pread(f.fileno(), size - offset, offset), offset
+
+
+def iter_lines(buf: Any, start: int) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield (line, end) for each newline-terminated line in buf from start, where
+    end is the position just past its newline. A trailing partial line (a
+    write still in progress) is left for the next read.
+    """
+    pos = start
+    while True:
+        newline = buf.find(b"\n", pos)
+        if newline < 0:
+            return
+        yield buf[pos:newline], newline + 1
+        pos = newline + 1
@@ -1,21 +1,26 @@
 """Queue adapters for the command bus (SQS, RabbitMQ, Redis, in-memory, file, etc.)."""
 
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Dict, Optional, Tuple
+
 from .file import FileQueueAdapter
 from .in_memory import InMemoryCommandBusAdapter
 from .sqs import SqsCommandBusAdapter
 
-__all__ = ["InMemoryCommandBusAdapter", "SqsCommandBusAdapter", "FileQueueAdapter"]
-
-try:
-    from .rabbitmq import RabbitMqCommandBusAdapter
+# Adapters imported on first use so that importing the package does not pay
+# for pika unless they are used: name -> (submodule, third-party module it needs)
+_LAZY: Dict[str, Tuple[str, Optional[str]]] = {
+    "RabbitMqCommandBusAdapter": (".rabbitmq", "pika"),
+    "RedisCommandBusAdapter": (".redis", None),
+}
 
-    __all__ += ["RabbitMqCommandBusAdapter"]
-except ImportError:
-    pass
+__all__ = ["InMemoryCommandBusAdapter", "SqsCommandBusAdapter", "FileQueueAdapter"] + [
+    name for name, (_, requires) in _LAZY.items() if requires is None or find_spec(requires) is not None
+]
 
-try:
-    from .redis import RedisCommandBusAdapter
 
-    __all__ += ["RedisCommandBusAdapter"]
-except ImportError:
-    pass
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        return getattr(import_module(_LAZY[name][0], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
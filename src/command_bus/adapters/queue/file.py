@@ -1,49 +1,153 @@
 """File-based queue adapter for persistent cross-process command queuing."""
 
+import asyncio
 import fcntl
+import heapq
+import itertools
 import json
+import os
+import threading
 import time
-import uuid
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Type
 
+from ..._json import JSONDecodeError, dumps, loads
 from ...interfaces import CommandBusAdapter, CommandMessage
+from ...parsers import MessageParserBase, ReprMessageParser
+from .._storage import default_storage_dir, iter_lines, read_tail
+
+# Record ids are random 128-bit hex strings drawn from os.urandom in bulk
+_ID_BATCH = 1024
+_id_buffer: List[str] = []
+_id_lock = threading.Lock()
+
+
+def _next_id() -> str:
+    """Return a fresh record id, refilling the buffer with one urandom call when empty."""
+    with _id_lock:
+        if not _id_buffer:
+            raw = os.urandom(16 * _ID_BATCH)
+            _id_buffer.extend(raw[i:i + 16].hex() for i in range(0, len(raw), 16))
+        return _id_buffer.pop()
+
+
+def _reset_ids() -> None:
+    """Forked children must not reuse the parent's buffered ids (or inherit a held lock)."""
+    global _id_lock
+    _id_lock = threading.Lock()
+    _id_buffer.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_ids)
+
+
+class _FileQueueMessage:
+    """Message wrapper with .body; _data keeps the record so dequeue() can delete by id."""
+
+    __slots__ = ("body", "_data")
+
+    def __init__(self, msg_data: Dict[str, Any]) -> None:
+        self.body = msg_data["message"]
+        self._data = msg_data
+
+    def __repr__(self) -> str:
+        return self.body
 
 
 class FileQueueAdapter(CommandBusAdapter):
     """File-based queue adapter that persists to disk for cross-process access."""
 
+    # Most records a single enqueue_async write coalesces
+    ASYNC_BATCH_SIZE = 32
+
     def __init__(
         self, 
         queue_name: str = "events", 
         storage_file: Path = None,
-        default_visibility_timeout: int = 60
+        default_visibility_timeout: int = 60,
+        message_parser_class: Optional[Type[MessageParserBase]] = None,
+        durability: str = "none",
     ) -> None:
         """
         Initialize file-based queue adapter.
         
         Args:
             queue_name: Name of the queue
-            storage_file: Path to JSON file for storage. Defaults to ~/.qubot/queue.json
+            storage_file: Path to the queue log (newline-delimited JSON). Defaults to ~/.qubot/queue.json
             default_visibility_timeout: Default visibility timeout in seconds (how long a message
                 is hidden after being retrieved). Defaults to 60 seconds.
+            message_parser_class: Parser whose serialize() produces message bodies. Use the
+                same class as the bus's message_parser_class (e.g. JsonMessageParser to
+                store JSON bodies). Defaults to ReprMessageParser.
+            durability: How each append is synced to disk: "none" (leave it to the OS,
+                fastest), "fdatasync" (sync the data) or "fsync" (data and metadata).
+                Batches from enqueue_many/enqueue_async are synced once per batch.
         """
+        if durability not in ("none", "fsync", "fdatasync"):
+            raise ValueError(f"durability must be 'none', 'fsync' or 'fdatasync', got {durability!r}")
         self.queue_name = queue_name
+        self.durability = durability
         self.default_visibility_timeout = default_visibility_timeout
+        self.message_parser_class = message_parser_class or ReprMessageParser
         
         if storage_file is None:
-            storage_dir = Path.home() / ".qubot"
-            storage_dir.mkdir(exist_ok=True)
-            storage_file = storage_dir / "queue.json"
+            storage_file = default_storage_dir() / "queue.json"
         
         self.storage_file = Path(storage_file)
         self._lock_file = self.storage_file.with_suffix('.lock')
         self._lock = None
+        self._lock_handle = None
+        self._lock_pid: Optional[int] = None
+        self._thread_lock = threading.RLock()
+        # In-memory replay of the log: live records by id (and grouped by
+        # queue_name, since one file may hold several queues), plus how far into
+        # which file (inode, byte offset) they reflect and the log's line count
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._by_queue: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Min-heap of (visible_at, seq, id) for this queue's records. Entries go
+        # stale when a record is hidden again or deleted and are skipped on pop.
+        self._ready_heap: List[Tuple[float, int, str]] = []
+        self._heap_seq = itertools.count()
+        # This queue's record ids by body, for dequeue() calls without an id
+        self._by_body: Dict[str, Dict[str, None]] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._lines = 0
+        # Set when a lock-free load found a legacy file it could not convert
+        self._legacy_pending = False
+        # Read handle kept open on the log between calls. Besides saving an
+        # open() per poll, it pins the inode: while it is open, a log swapped
+        # in by another process's compaction cannot be given the same inode
+        # number, which would make the replay resume at a stale offset.
+        self._reader: Optional[BinaryIO] = None
+        # Records waiting for the enqueue_async writer, with their callers' futures
+        self._pending: List[Tuple[bytes, "asyncio.Future[None]"]] = []
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+    def _acquire_lock(self, shared: bool = False):
+        """
+        Simple file-based lock.
+
+        Producers only append whole lines with O_APPEND, which the kernel keeps
+        atomic, so they take the lock shared and never wait on each other. The
+        exclusive lock is for consumers: claiming and deleting messages and
+        compacting the log, which must not race with appends to the old file.
 
-    def _acquire_lock(self):
-        """Simple file-based lock."""
-        self._lock = open(self._lock_file, 'w', encoding='utf-8')
-        fcntl.flock(self._lock.fileno(), fcntl.LOCK_EX)
+        The lock file stays open between calls. flock belongs to the open file,
+        so threads sharing this adapter are serialized in-process first, and a
+        forked child opens its own handle rather than sharing the parent's.
+        """
+        self._thread_lock.acquire()
+        try:
+            if self._lock_handle is None or self._lock_pid != os.getpid():
+                self._lock_handle = open(self._lock_file, 'w', encoding='utf-8')
+                self._lock_pid = os.getpid()
+            fcntl.flock(self._lock_handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._lock = self._lock_handle
 
     def _release_lock(self):
         """Release file-based lock."""
@@ -53,81 +157,367 @@ class FileQueueAdapter(CommandBusAdapter):
             except (OSError, ValueError):
                 pass
             finally:
-                self._lock.close()
                 self._lock = None
+                self._thread_lock.release()
 
-    def _load_queue(self) -> List[Dict[str, Any]]:
-        """Load queue from disk."""
-        if not self.storage_file.exists():
-            return []
+    def _reset_state(self, inode: Optional[int] = None) -> None:
+        self._records = {}
+        self._by_queue = {}
+        self._ready_heap = []
+        self._by_body = {}
+        self._inode = inode
+        self._offset = 0
+        self._lines = 0
+        self._legacy_pending = False
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Apply a single log entry to the in-memory records."""
+        if "deleted" in entry:
+            self._remove(entry["deleted"])
+        elif "hidden" in entry:
+            for msg_id in entry["hidden"]:
+                record = self._records.get(msg_id)
+                if record is not None:
+                    record["hidden_until"] = entry["hidden_until"]
+                    self._push_ready(record)
+        else:
+            self._add(entry)
+
+    @staticmethod
+    def _visible_at(record: Dict[str, Any]) -> float:
+        return max(record.get("delay_until", 0), record.get("hidden_until", 0))
+
+    def _has_ready(self, now: float) -> bool:
+        """Whether the heap's earliest entry is due (it may turn out stale; never a false negative)."""
+        return bool(self._ready_heap) and self._ready_heap[0][0] <= now
+
+    def _push_ready(self, record: Dict[str, Any]) -> None:
+        if record.get("queue_name") == self.queue_name:
+            heapq.heappush(
+                self._ready_heap,
+                (self._visible_at(record), next(self._heap_seq), record["id"]),
+            )
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        self._records[record["id"]] = record
+        self._by_queue.setdefault(record.get("queue_name"), {})[record["id"]] = record
+        if record.get("queue_name") == self.queue_name:
+            self._by_body.setdefault(record.get("message"), {})[record["id"]] = None
+        self._push_ready(record)
+
+    def _remove(self, msg_id: str) -> None:
+        record = self._records.pop(msg_id, None)
+        if record is not None:
+            self._by_queue[record.get("queue_name")].pop(msg_id, None)
+            ids = self._by_body.get(record.get("message"))
+            if ids is not None:
+                ids.pop(msg_id, None)
+                if not ids:
+                    del self._by_body[record.get("message")]
+
+    def _load_queue(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the in-memory records up to date with the log on disk.
+
+        The log is newline-delimited JSON: one line per enqueued record, plus
+        {"hidden": [ids], "hidden_until": t} visibility updates and
+        {"deleted": id} tombstones. Only bytes appended since the last call are
+        read, so polling an unchanged queue costs a single stat(). A changed
+        inode (the file was compacted or replaced) triggers a full replay.
+
+        Safe to call without the lock: writers only append whole lines and
+        compaction swaps in a complete file with os.replace, so a reader sees
+        either the old log or the new one. Converting a legacy file rewrites
+        it and is therefore deferred until the lock is held.
+        """
+        # Threads sharing this adapter must not replay the same lines twice
+        with self._thread_lock:
+            return self._catch_up()
+
+    def _catch_up(self) -> Dict[str, Dict[str, Any]]:
+        """Body of _load_queue; the caller holds _thread_lock."""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+            st = os.stat(self.storage_file)
+        except FileNotFoundError:
+            self._reset_state()
+            return self._records
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            self._reset_state(st.st_ino)
+        if st.st_size == self._offset:
+            return self._records
+        size = st.st_size
+        reader = self._reader
+        if reader is None or os.fstat(reader.fileno()).st_ino != st.st_ino:
+            if reader is not None:
+                reader.close()
+                self._reader = None
+            try:
+                reader = open(self.storage_file, 'rb')
+            except FileNotFoundError:
+                self._reset_state()
+                return self._records
+            self._reader = reader
+            # The file may have been swapped since stat(); trust the open fd
+            fst = os.fstat(reader.fileno())
+            if fst.st_ino != self._inode:
+                self._reset_state(fst.st_ino)
+            size = fst.st_size
+        with read_tail(reader, self._offset, size) as (buf, base):
+            self._replay(buf, base)
+        return self._records
+
+    def _replay(self, buf: Any, base: int = 0) -> None:
+        """Apply the complete log lines in buf past self._offset; buf[0] sits at file offset base."""
+        start = self._offset - base
+        if self._offset == 0 and buf[:1] == b"[":
+            if self._lock is not None:
+                self._load_legacy(bytes(buf))
+            else:
+                self._legacy_pending = True
+            return
+        for line, end in iter_lines(buf, start):
+            self._offset = base + end
+            if not line.strip():
+                continue
+            self._lines += 1
+            try:
+                self._apply(loads(line))
+            except (JSONDecodeError, KeyError, TypeError):
+                # Skip corrupt lines; they are dropped on the next compaction
+                pass
+
+    def _load_legacy(self, data: bytes) -> None:
+        """Import a queue file written as a single JSON array and rewrite it as a log."""
+        text = data.decode("utf-8", errors="replace")
+        try:
+            queue, end = json.JSONDecoder().raw_decode(text)
+        except ValueError:
+            queue, end = [], len(text)
+        for record in queue:
+            self._add(record)
+        self._legacy_pending = False
+        # Producers append without reading, so log lines may follow the array
+        for line in text[end:].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(loads(line))
+            except (JSONDecodeError, KeyError, TypeError):
+                pass
+        self._compact()
+
+    def _append(self, *entries: Dict[str, Any]) -> bool:
+        """
+        Append entries to the log. Must be called with the lock held (shared
+        is enough).
+
+        When the caller loaded the log first, the in-memory offset is advanced
+        past the appended bytes so they are not replayed again, and True is
+        returned: the caller must then apply the entries itself. Otherwise
+        they are picked up by the next _load_queue.
+        """
+        data = b"".join(dumps(entry) + b"\n" for entry in entries)
+        inode, offset = self._write(data)
+        if inode == self._inode and offset == self._offset:
+            self._offset += len(data)
+            self._lines += len(entries)
+            return True
+        return False
 
-    def _save_queue(self, queue: List[Dict[str, Any]]) -> None:
-        """Save queue to disk."""
+    def _write(self, data: bytes) -> Tuple[int, int]:
+        """Append raw log bytes; return the file's inode and the offset they landed at."""
         try:
             # Create parent directory if it doesn't exist
             self.storage_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(queue, f, indent=2)
+            fd = os.open(self.storage_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # A single O_APPEND write lands whole even with other appenders
+                written = os.write(fd, data)
+                while written < len(data):
+                    written += os.write(fd, data[written:])
+                self._sync(fd)
+                offset = os.lseek(fd, 0, os.SEEK_CUR) - len(data)
+                inode = os.fstat(fd).st_ino
+            finally:
+                os.close(fd)
         except Exception as e:
             raise RuntimeError(f"Failed to save queue: {e}") from e
+        return inode, offset
+
+    def _sync(self, fd: int) -> None:
+        """Flush an append to disk according to self.durability."""
+        if self.durability == "fdatasync" and hasattr(os, "fdatasync"):
+            os.fdatasync(fd)
+        elif self.durability != "none":
+            # fdatasync is not available everywhere (e.g. macOS)
+            os.fsync(fd)
+
+    def _write_detached(self, data: bytes) -> None:
+        """
+        Append log bytes from a worker thread.
+
+        Uses its own lock handle and leaves the in-memory state alone, so it
+        never races with the event loop thread; the lines are picked up by the
+        next _load_queue like any other producer's.
+        """
+        with open(self._lock_file, 'w', encoding='utf-8') as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_SH)
+            try:
+                self._write(data)
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the log once dead lines (tombstones, stale records) outnumber live ones."""
+        if self._lines - len(self._records) > len(self._records):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Atomically rewrite the log with only the live records. Must be called with the lock held."""
+        data = b"".join(dumps(record) + b"\n" for record in self._records.values())
+        tmp_file = self.storage_file.with_name(self.storage_file.name + ".tmp")
+        try:
+            self.storage_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                f.flush()
+                # Always synced, whatever self.durability says: the swap replaces
+                # records that may already be on disk
+                os.fsync(f.fileno())
+                inode = os.fstat(f.fileno()).st_ino
+            os.replace(tmp_file, self.storage_file)
+            # Pin the new log's inode too; the exclusive lock keeps anyone else from swapping it first
+            reader = open(self.storage_file, 'rb')
+        except Exception as e:
+            raise RuntimeError(f"Failed to save queue: {e}") from e
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = reader
+        self._inode = inode
+        self._offset = len(data)
+        self._lines = len(self._records)
+        # Drop stale heap entries while we are rewriting everything anyway
+        self._ready_heap = []
+        for record in self._by_queue.get(self.queue_name, {}).values():
+            self._push_ready(record)
+
+    def _build_record(
+        self,
+        message_instance: CommandMessage,
+        delay_seconds: int,
+        body: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the log record for a message (pass body if it is already serialized)."""
+        if body is None:
+            body = self.message_parser_class.serialize(message_instance)
+        return {
+            "id": _next_id(),
+            "message": body,
+            "delay_until": time.time() + delay_seconds,
+            "queue_name": self.queue_name,
+            "hidden_until": 0  # Initially visible
+        }
 
     def enqueue(self, message_instance: CommandMessage, delay_seconds: int = 0) -> None:
         """Add a message to the queue."""
+        self.enqueue_many([message_instance], delay_seconds=delay_seconds)
+
+    def enqueue_many(
+        self,
+        message_instances: Iterable[CommandMessage],
+        delay_seconds: int = 0,
+    ) -> None:
+        """Add several messages to the queue with a single lock and a single write."""
+        # Serialize each distinct object once, even if the batch repeats it. The
+        # instance is kept alongside its body so its id() cannot be reused.
+        bodies: Dict[int, Tuple[CommandMessage, str]] = {}
+        records = []
+        for message_instance in message_instances:
+            cached = bodies.get(id(message_instance))
+            if cached is None:
+                cached = bodies[id(message_instance)] = (
+                    message_instance,
+                    self.message_parser_class.serialize(message_instance),
+                )
+            records.append(self._build_record(message_instance, delay_seconds, body=cached[1]))
+        if not records:
+            return
         try:
-            self._acquire_lock()
-            queue = self._load_queue()
+            self._acquire_lock(shared=True)
+            if self._append(*records):
+                # Skipped by replay from now on, so they must be recorded here
+                for record in records:
+                    self._add(record)
+        finally:
+            self._release_lock()
 
-            # Serialize the message with full module path
-            # Format: module.ClassName(arg1=val1, arg2=val2, ...)
-            class_name = message_instance.__class__.__name__
-            module_name = message_instance.__class__.__module__
-            full_class_path = f"{module_name}.{class_name}"
+    async def enqueue_async(self, message_instance: CommandMessage, delay_seconds: int = 0) -> None:
+        """
+        Add a message to the queue without blocking the event loop.
 
-            # Get the arguments from the message instance
-            if hasattr(message_instance, 'model_dump'):
-                args_dict = message_instance.model_dump()
+        The write runs in the default executor. Calls made while a write is in
+        flight are coalesced, up to ASYNC_BATCH_SIZE at a time, into a single
+        append.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((dumps(self._build_record(message_instance, delay_seconds)) + b"\n", future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_pending())
+        await future
+
+    async def _flush_pending(self) -> None:
+        """Write queued enqueue_async records in batches until none are left."""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch = self._pending[:self.ASYNC_BATCH_SIZE]
+            del self._pending[:self.ASYNC_BATCH_SIZE]
+            try:
+                await loop.run_in_executor(None, self._write_detached, b"".join(line for line, _ in batch))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
             else:
-                args_dict = message_instance.__dict__
-            
-            args_str = ", ".join(f"{k}={repr(v)}" for k, v in args_dict.items())
-            message_str = f"{full_class_path}({args_str})"
-
-            queue.append({
-                "id": str(uuid.uuid4()),
-                "message": message_str,
-                "delay_until": time.time() + delay_seconds,
-                "queue_name": self.queue_name,
-                "hidden_until": 0  # Initially visible
-            })
-
-            self._save_queue(queue)
-        finally:
-            self._release_lock()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
 
     def dequeue(self, message_instance: Any) -> None:
         """Remove a message from the queue."""
+        self.dequeue_batch([message_instance])
+
+    def dequeue_batch(self, message_instances: Iterable[Any]) -> None:
+        """Remove several messages under one lock, with a single log append."""
+        # Catch up on new log lines before locking; the locked reload is then a stat()
+        self._load_queue()
         try:
             self._acquire_lock()
-            queue = self._load_queue()
+            self._load_queue()
+            queue = self._by_queue.get(self.queue_name, {})
 
-            # Find and remove the message by ID (more reliable than message string)
-            msg_id = None
-            if hasattr(message_instance, '_data') and isinstance(message_instance._data, dict):
-                msg_id = message_instance._data.get("id")  # noqa: SLF001
-            
-            if msg_id:
-                queue[:] = [msg for msg in queue if msg.get("id") != msg_id]
-            else:
-                # Fallback to message string matching
-                message_str = message_instance.body if hasattr(message_instance, 'body') else str(message_instance)
-                queue[:] = [msg for msg in queue if msg.get("message") != message_str]
+            msg_ids: List[str] = []
+            for message_instance in message_instances:
+                # Find and remove the message by ID (more reliable than message string)
+                msg_id = None
+                if hasattr(message_instance, '_data') and isinstance(message_instance._data, dict):
+                    msg_id = message_instance._data.get("id")  # noqa: SLF001
+
+                if msg_id:
+                    candidates = [msg_id] if msg_id in queue else []
+                else:
+                    # Fallback to message string matching
+                    message_str = message_instance.body if hasattr(message_instance, 'body') else str(message_instance)
+                    candidates = self._by_body.get(message_str, ())
+                msg_ids.extend(candidates)
+            # The same record may be named twice (e.g. two messages with one body)
+            msg_ids = list(dict.fromkeys(msg_ids))
 
-            self._save_queue(queue)
+            if msg_ids:
+                self._append(*({"deleted": i} for i in msg_ids))
+                for i in msg_ids:
+                    self._remove(i)
+                self._maybe_compact()
         finally:
             self._release_lock()
 
@@ -147,47 +537,48 @@ class FileQueueAdapter(CommandBusAdapter):
             visibility_timeout: How long (in seconds) to hide the message after retrieval.
                 If None, uses the adapter's default_visibility_timeout.
         """
+        # Catch up on new log lines before locking; the locked reload is then a stat()
+        self._load_queue()
+        current_time = time.time()
+        # Nothing is ready (or wanted): an empty poll costs one stat() and never takes the lock
+        if max_messages < 1 or (not self._legacy_pending and not self._has_ready(current_time)):
+            return []
         try:
             self._acquire_lock()
-            queue = self._load_queue()
-            current_time = time.time()
+            self._load_queue()
+            queue = self._by_queue.get(self.queue_name, {})
             
             # Use provided visibility timeout or default
             vis_timeout = visibility_timeout if visibility_timeout is not None else self.default_visibility_timeout
 
-            # Filter messages for this queue that are:
-            # 1. For this queue name
-            # 2. Delay has passed (delay_until <= current_time)
-            # 3. Not currently hidden (hidden_until <= current_time)
-            visible_messages = [
-                msg for msg in queue
-                if msg.get("queue_name") == self.queue_name
-                and msg.get("delay_until", 0) <= current_time
-                and msg.get("hidden_until", 0) <= current_time
-            ]
-
-            # Limit to max_messages
-            messages_to_return = visible_messages[:max_messages]
-            
+            # Pop messages whose delay and visibility timeout have both passed
+            # (visible_at <= current_time), skipping stale and duplicate heap entries
+            messages_to_return = []
+            returned_ids = set()
+            heap = self._ready_heap
+            while heap and heap[0][0] <= current_time and len(messages_to_return) < max_messages:
+                visible_at, _, msg_id = heapq.heappop(heap)
+                msg = queue.get(msg_id)
+                if msg is None or msg_id in returned_ids or self._visible_at(msg) != visible_at:
+                    continue
+                returned_ids.add(msg_id)
+                messages_to_return.append(msg)
+
             # Update hidden_until for returned messages (only if visibility_timeout > 0)
-            if vis_timeout > 0:
+            if vis_timeout > 0 and messages_to_return:
+                hidden_until = current_time + vis_timeout
+                self._append({
+                    "hidden": [msg["id"] for msg in messages_to_return],
+                    "hidden_until": hidden_until,
+                })
                 for msg in messages_to_return:
-                    msg["hidden_until"] = current_time + vis_timeout
-                
-                # Save the updated queue with new hidden_until values
-                if messages_to_return:
-                    self._save_queue(queue)
+                    msg["hidden_until"] = hidden_until
+            # Re-queue returned messages at their new visible_at (unchanged if not hidden)
+            for msg in messages_to_return:
+                self._push_ready(msg)
 
             # Return as message objects (the bus will parse them)
-            class QueueMessage:
-                def __init__(self, msg_data: Dict[str, Any]):
-                    self.body = msg_data["message"]
-                    self._data = msg_data
-
-                def __repr__(self):
-                    return self.body
-
-            return [QueueMessage(msg) for msg in messages_to_return]
+            return [_FileQueueMessage(msg) for msg in messages_to_return]
         finally:
             self._release_lock()
 
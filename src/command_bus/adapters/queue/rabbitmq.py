@@ -1,9 +1,11 @@
 """RabbitMQ-backed command bus adapter."""
 
+import threading
 from typing import Any, List, Optional
 
 import pika
 from pika.adapters.blocking_connection import BlockingChannel
+from pika.exceptions import AMQPChannelError, AMQPConnectionError
 
 from ...interfaces import CommandBusAdapter, CommandMessage
 
@@ -38,28 +40,48 @@ class RabbitMqCommandBusAdapter(CommandBusAdapter):
         self._connection_params = connection_params
         self._connection: Optional[pika.BlockingConnection] = None
         self._channel: Optional[BlockingChannel] = None
+        # Publishing keeps its own long-lived connection, separate from the
+        # consumer's, so enqueue() never interleaves with get_messages()/acks
+        self._publish_connection: Optional[pika.BlockingConnection] = None
+        self._publish_channel: Optional[BlockingChannel] = None
+        # pika's BlockingConnection is not thread-safe; serializes enqueue()
+        # calls from several threads (e.g. asyncio.to_thread) on the shared publisher
+        self._publish_lock = threading.Lock()
+
+    def _connect(self) -> pika.BlockingConnection:
+        if self._connection_url:
+            return pika.BlockingConnection(pika.URLParameters(self._connection_url))
+        return pika.BlockingConnection(self._connection_params)
 
     def _ensure_connection(self) -> BlockingChannel:
         if self._channel is None or self._channel.is_closed:
-            if self._connection_url:
-                self._connection = pika.BlockingConnection(
-                    pika.URLParameters(self._connection_url)
-                )
-            else:
-                self._connection = pika.BlockingConnection(self._connection_params)
+            self._connection = self._connect()
             self._channel = self._connection.channel()
             self._channel.queue_declare(queue=self.queue_name, durable=True)
         return self._channel
 
-    def _connection_for_publish(self) -> tuple:
-        """Short-lived connection for publishing (no shared state)."""
-        if self._connection_url:
-            conn = pika.BlockingConnection(pika.URLParameters(self._connection_url))
-        else:
-            conn = pika.BlockingConnection(self._connection_params)
-        ch = conn.channel()
-        ch.queue_declare(queue=self.queue_name, durable=True)
-        return conn, ch
+    def _ensure_publish_channel(self) -> BlockingChannel:
+        """
+        Open the publishing connection on first use (or after it dropped) and declare the queue once.
+
+        Must be called with _publish_lock held.
+        """
+        if self._publish_channel is None or self._publish_channel.is_closed:
+            self._close_publisher()
+            self._publish_connection = self._connect()
+            self._publish_channel = self._publish_connection.channel()
+            self._publish_channel.queue_declare(queue=self.queue_name, durable=True)
+        return self._publish_channel
+
+    def _close_publisher(self) -> None:
+        connection = self._publish_connection
+        self._publish_channel = None
+        self._publish_connection = None
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except (AMQPConnectionError, AMQPChannelError):
+                pass
 
     def enqueue(
         self,
@@ -67,16 +89,23 @@ class RabbitMqCommandBusAdapter(CommandBusAdapter):
         delay_seconds: int = 0,
     ) -> None:
         """Add a message to the queue. (delay_seconds is ignored; use a delayed-exchange plugin for delays.)"""
-        conn, ch = self._connection_for_publish()
-        try:
-            ch.basic_publish(
-                exchange="",
-                routing_key=self.queue_name,
-                body=str(message_instance),
-                properties=pika.BasicProperties(delivery_mode=2),  # persistent
-            )
-        finally:
-            conn.close()
+        body = str(message_instance)
+        with self._publish_lock:
+            for attempt in range(2):
+                channel = self._ensure_publish_channel()
+                try:
+                    channel.basic_publish(
+                        exchange="",
+                        routing_key=self.queue_name,
+                        body=body,
+                        properties=pika.BasicProperties(delivery_mode=2),  # persistent
+                    )
+                    return
+                except (AMQPConnectionError, AMQPChannelError):
+                    # The broker dropped the connection since the last publish; reconnect once
+                    self._close_publisher()
+                    if attempt:
+                        raise
 
     def dequeue(self, message_instance: Any) -> None:
         """Ack the message (remove from queue after successful processing)."""
@@ -110,10 +139,12 @@ class RabbitMqCommandBusAdapter(CommandBusAdapter):
         return out
 
     def close(self) -> None:
-        """Close the consumer connection (optional; call when done with get_messages)."""
+        """Close the consumer and publishing connections (optional; call when done with the adapter)."""
         if self._channel and not self._channel.is_closed:
             self._channel.close()
         if self._connection and self._connection.is_open:
             self._connection.close()
         self._channel = None
         self._connection = None
+        with self._publish_lock:
+            self._close_publisher()
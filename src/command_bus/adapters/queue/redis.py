@@ -1,8 +1,9 @@
 """Redis-backed command bus adapter using Redis Lists (LPUSH/BRPOP)."""
 
-from typing import Any, List
+from typing import Any, List, Optional, Type
 
 from ...interfaces import CommandBusAdapter, CommandMessage
+from ...parsers import MessageParserBase, ReprMessageParser
 
 
 class _RedisMessage:
@@ -18,15 +19,30 @@ class _RedisMessage:
         pass
 
 
+def _body(raw: Any) -> str:
+    return raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+
 class RedisCommandBusAdapter(CommandBusAdapter):
     """
     CommandBus adapter using a Redis List for queue operations (LPUSH to enqueue, BRPOP to consume).
     FIFO: producers LPUSH, workers BRPOP. delay_seconds is not supported (use a delayed-queue pattern separately if needed).
+
+    Bodies are written with message_parser_class.serialize(); pass the bus's
+    parser class (e.g. JsonMessageParser, whose serialize() uses Pydantic's
+    model_dump_json()). Defaults to ReprMessageParser, whose repr-style
+    bodies are built from model_dump().
     """
 
-    def __init__(self, redis_client: Any, queue_name: str) -> None:
+    def __init__(
+        self,
+        redis_client: Any,
+        queue_name: str,
+        message_parser_class: Optional[Type[MessageParserBase]] = None,
+    ) -> None:
         self._redis = redis_client
         self.queue_name = queue_name
+        self.message_parser_class = message_parser_class or ReprMessageParser
 
     def enqueue(
         self,
@@ -34,7 +50,7 @@ class RedisCommandBusAdapter(CommandBusAdapter):
         delay_seconds: int = 0,
     ) -> None:
         """Add a message to the queue. delay_seconds is ignored (Redis List has no native delay)."""
-        self._redis.lpush(self.queue_name, str(message_instance))
+        self._redis.lpush(self.queue_name, self.message_parser_class.serialize(message_instance))
 
     def dequeue(self, message_instance: Any) -> None:
         """No-op: message was already removed when get_messages() used BRPOP."""
@@ -47,21 +63,34 @@ class RedisCommandBusAdapter(CommandBusAdapter):
         wait_seconds: int = 0,
         **kwargs: Any,
     ) -> List[_RedisMessage]:
-        """Fetch messages from the queue. Uses BRPOP (blocking) when wait_seconds > 0, else RPOP (non-blocking)."""
+        """
+        Fetch messages from the queue. The first uses BRPOP (blocking) when
+        wait_seconds > 0; the rest are RPOPs, pipelined into one round-trip
+        when more than one is needed.
+        """
         out: List[_RedisMessage] = []
-        timeout = max(0, wait_seconds)
-        for i in range(max_messages):
-            if timeout > 0 and i == 0:
-                result = self._redis.brpop(self.queue_name, timeout=timeout)
-            else:
-                result = self._redis.rpop(self.queue_name)
+        remaining = max_messages
+        if wait_seconds > 0 and remaining > 0:
+            result = self._redis.brpop(self.queue_name, timeout=wait_seconds)
             if result is None:
-                break
-            # brpop returns (key, value); rpop returns value only
-            if isinstance(result, (list, tuple)):
-                _, raw = result
-            else:
-                raw = result
-            body = raw.decode("utf-8") if isinstance(raw, bytes) else raw
-            out.append(_RedisMessage(body=body))
+                return out
+            # brpop returns (key, value)
+            out.append(_RedisMessage(body=_body(result[1])))
+            remaining -= 1
+        if remaining == 1:
+            raws = [self._redis.rpop(self.queue_name)]
+        elif remaining > 1:
+            pipe = self._redis.pipeline(transaction=False)
+            for _ in range(remaining):
+                pipe.rpop(self.queue_name)
+            raws = pipe.execute()
+        else:
+            raws = []
+        for raw in raws:
+            if raw is None:
+                # The pipeline is not atomic: other consumers may drain the list
+                # partway through and producers refill it, so a gap can be
+                # followed by payloads that were already popped
+                continue
+            out.append(_RedisMessage(body=_body(raw)))
         return out
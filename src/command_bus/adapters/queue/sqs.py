@@ -1,9 +1,15 @@
 """SQS-backed command bus adapter."""
 
-from typing import Any
+import logging
+from typing import Any, Iterable, List
 
 from ...interfaces import CommandBusAdapter, CommandMessage
 
+logger = logging.getLogger(__name__)
+
+# Most entries SQS accepts in one SendMessageBatch/DeleteMessageBatch request
+_BATCH_SIZE = 10
+
 
 class SqsCommandBusAdapter(CommandBusAdapter):
     """CommandBus adapter using AWS SQS for queue operations."""
@@ -26,17 +32,70 @@ class SqsCommandBusAdapter(CommandBusAdapter):
             DelaySeconds=delay_seconds,
         )
 
+    def enqueue_many(
+        self,
+        message_instances: Iterable[CommandMessage],
+        delay_seconds: int = 0,
+    ) -> None:
+        """Add several messages with SendMessageBatch (10 per request)."""
+        bodies = [str(message_instance) for message_instance in message_instances]
+        for start in range(0, len(bodies), _BATCH_SIZE):
+            response = self.sqs_queue.send_messages(
+                Entries=[
+                    {"Id": str(i), "MessageBody": body, "DelaySeconds": delay_seconds}
+                    for i, body in enumerate(bodies[start:start + _BATCH_SIZE])
+                ]
+            )
+            failed = response.get("Failed") if isinstance(response, dict) else None
+            if failed:
+                # A batch can partly fail; report it rather than dropping messages silently
+                raise RuntimeError(
+                    f"SQS rejected {len(failed)} of the messages in a batch: "
+                    + "; ".join(f"{f.get('Code')}: {f.get('Message')}" for f in failed)
+                )
+
     def dequeue(self, message_instance: Any) -> None:
         """Remove a message from the queue (e.g. after successful processing)."""
         message_instance.delete()
 
+    def dequeue_batch(self, message_instances: Iterable[Any]) -> None:
+        """
+        Delete several received messages with DeleteMessageBatch (10 per request).
+
+        Entries a request reports as Failed are logged and deleted one by one
+        with dequeue(), which raises like a single dequeue would if SQS still
+        refuses; otherwise those messages would silently be redelivered.
+        """
+        messages: List[Any] = list(message_instances)
+        retry: List[Any] = []
+        for start in range(0, len(messages), _BATCH_SIZE):
+            chunk = messages[start:start + _BATCH_SIZE]
+            response = self.sqs_queue.delete_messages(
+                Entries=[
+                    {"Id": str(i), "ReceiptHandle": message.receipt_handle}
+                    for i, message in enumerate(chunk)
+                ]
+            )
+            failed = response.get("Failed") if isinstance(response, dict) else None
+            for f in failed or ():
+                logger.warning(
+                    "SQS failed to delete a message in a batch (%s: %s); retrying it alone",
+                    f.get("Code"),
+                    f.get("Message"),
+                )
+                retry.append(chunk[int(f["Id"])])
+        for message in retry:
+            self.dequeue(message)
+
     def get_messages(
         self,
         max_messages: int = 1,
         wait_seconds: int = 0,
         visibility_timeout: int = 60,
     ) -> Any:
-        """Fetch messages from the queue."""
+        """Fetch up to max_messages (1 to 10, the SQS limit) messages from the queue."""
+        if not 1 <= max_messages <= _BATCH_SIZE:
+            raise ValueError(f"max_messages must be between 1 and {_BATCH_SIZE}, got {max_messages}")
         return self.sqs_queue.receive_messages(
             MessageAttributeNames=["ALL"],
             MaxNumberOfMessages=max_messages,
@@ -1,13 +1,24 @@
-"""Response store adapters for request/response over the command bus (Redis, in-memory, file, etc.)."""
+"""Response store adapters for request/response over the command bus (Redis, in-memory, file, SQLite, etc.)."""
+
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Dict, Optional, Tuple
 
 from .file import FileResponseStore
 from .in_memory import InMemoryResponseStore
+from .sqlite import SqliteResponseStore
+
+# Imported on first use, like the optional queue adapters: name -> (submodule, third-party module it needs)
+_LAZY: Dict[str, Tuple[str, Optional[str]]] = {
+    "RedisResponseStore": (".redis", None),
+}
 
-__all__ = ["InMemoryResponseStore", "FileResponseStore"]
+__all__ = ["InMemoryResponseStore", "FileResponseStore", "SqliteResponseStore"] + [
+    name for name, (_, requires) in _LAZY.items() if requires is None or find_spec(requires) is not None
+]
 
-try:
-    from .redis import RedisResponseStore
 
-    __all__ += ["RedisResponseStore"]
-except ImportError:
-    pass
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        return getattr(import_module(_LAZY[name][0], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,36 +2,76 @@
 
 import fcntl
 import json
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 
+from ..._json import JSONDecodeError, dumps, loads
 from ...interfaces import ResponseStore
+from .._storage import default_storage_dir, iter_lines, read_tail
 
 
 class FileResponseStore(ResponseStore):
-    """File-based response store that persists to disk for cross-process access."""
+    """
+    File-based response store that persists to disk for cross-process access.
+
+    get() never writes, compacts or removes anything: an expired entry just
+    reads as missing. Expired entries are dropped from the log by vacuum(),
+    which set() also runs every VACUUM_INTERVAL calls, and by the compactions
+    set() and delete() run once dead lines outnumber live ones.
+    """
+
+    # set() calls between automatic vacuum() passes
+    VACUUM_INTERVAL = 256
 
     def __init__(self, storage_file: Optional[Path] = None) -> None:
         """
         Initialize file-based response store.
-        
+
         Args:
-            storage_file: Path to JSON file for storage. Defaults to ~/.qubot/responses.json
+            storage_file: Path to the store log (newline-delimited JSON). Defaults to ~/.qubot/responses.json
         """
         if storage_file is None:
-            storage_dir = Path.home() / ".qubot"
-            storage_dir.mkdir(exist_ok=True)
-            storage_file = storage_dir / "responses.json"
-        
+            storage_file = default_storage_dir() / "responses.json"
+
         self.storage_file = Path(storage_file)
+        # Created once here rather than before every write; the lock file lives there too
+        self.storage_file.parent.mkdir(parents=True, exist_ok=True)
         self._lock_file = self.storage_file.with_suffix('.lock')
         self._lock = None
+        # Serializes threads sharing this store around the replay state and the flock
+        self._thread_lock = threading.RLock()
+        # In-memory replay of the log: live entries by key, plus how far into
+        # which file (inode, byte offset) they reflect and the log's line count
+        self._store: Dict[str, Dict[str, Any]] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._lines = 0
+        # Set when a lock-free load found a legacy file it could not convert
+        self._legacy_pending = False
+        # Read handle kept open between calls; reopened when the log is replaced
+        self._reader: Optional[BinaryIO] = None
+        self._sets_since_vacuum = 0
 
     def _acquire_lock(self):
-        """Acquire file-based lock."""
-        self._lock = open(self._lock_file, 'w', encoding='utf-8')
-        fcntl.flock(self._lock.fileno(), fcntl.LOCK_EX)
+        """
+        Acquire file-based lock.
+
+        Only writers (set, delete, vacuum, and converting a legacy file) take
+        it; get() reads the log without it and never removes expired entries.
+        """
+        self._thread_lock.acquire()
+        try:
+            self._lock = open(self._lock_file, 'w', encoding='utf-8')
+            fcntl.flock(self._lock.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            if self._lock is not None:
+                self._lock.close()
+                self._lock = None
+            self._thread_lock.release()
+            raise
 
     def _release_lock(self):
         """Release file-based lock."""
@@ -43,87 +83,248 @@ class FileResponseStore(ResponseStore):
             finally:
                 self._lock.close()
                 self._lock = None
+                self._thread_lock.release()
+
+    def _reset_state(self, inode: Optional[int] = None) -> None:
+        self._store = {}
+        self._inode = inode
+        self._offset = 0
+        self._lines = 0
+        self._legacy_pending = False
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Apply a single log entry to the in-memory store."""
+        if "deleted" in entry:
+            self._store.pop(entry["deleted"], None)
+        else:
+            self._store[entry["key"]] = entry
 
     def _load_store(self) -> Dict[str, Dict[str, Any]]:
-        """Load store from disk."""
-        if not self.storage_file.exists():
-            return {}
+        """
+        Bring the in-memory store up to date with the log on disk.
+
+        The log is newline-delimited JSON: {"key", "data", "expiry"} lines for
+        set() and {"deleted": key} tombstones. Lines written before values were
+        stored natively carry a JSON-encoded "value" string instead of "data". Only bytes appended since the
+        last call are read; a changed inode (the file was compacted) triggers a
+        full replay.
+
+        Safe to call without the lock: writers append whole lines and
+        compaction swaps in a complete file with os.replace. Converting a
+        legacy file rewrites it and is therefore deferred until the lock is held.
+        """
+        with self._thread_lock:
+            return self._catch_up()
+
+    def _catch_up(self) -> Dict[str, Dict[str, Any]]:
+        """Body of _load_store; the caller holds _thread_lock."""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+            st = os.stat(self.storage_file)
+        except FileNotFoundError:
+            self._reset_state()
+            return self._store
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            self._reset_state(st.st_ino)
+        if st.st_size == self._offset:
+            return self._store
+        size = st.st_size
+        reader = self._reader
+        if reader is None or os.fstat(reader.fileno()).st_ino != st.st_ino:
+            if reader is not None:
+                reader.close()
+                self._reader = None
+            try:
+                reader = open(self.storage_file, 'rb')
+            except FileNotFoundError:
+                self._reset_state()
+                return self._store
+            self._reader = reader
+            # The file may have been swapped since stat(); trust the open fd
+            fst = os.fstat(reader.fileno())
+            if fst.st_ino != self._inode:
+                self._reset_state(fst.st_ino)
+            size = fst.st_size
+        with read_tail(reader, self._offset, size) as (buf, base):
+            self._replay(buf, base)
+        return self._store
+
+    def _replay(self, buf: Any, base: int) -> None:
+        """Apply the complete log lines in buf, whose first byte is at file offset base."""
+        start = self._offset - base
+        if self._offset == 0 and self._is_legacy(buf):
+            if self._lock is not None:
+                self._load_legacy(bytes(buf))
+            else:
+                self._legacy_pending = True
+            return
+        for line, end in iter_lines(buf, start):
+            self._offset = base + end
+            if not line.strip():
+                continue
+            self._lines += 1
+            try:
+                self._apply(loads(line))
+            except (JSONDecodeError, KeyError, TypeError):
+                # Skip corrupt lines; they are dropped on the next compaction
+                pass
+
+    @staticmethod
+    def _is_legacy(data: Any) -> bool:
+        """Whether data is a store written as a single {key: entry} JSON object."""
+        newline = data.find(b"\n")
+        try:
+            first = loads(data[:newline] if newline >= 0 else data)
+        except JSONDecodeError:
+            first = None
+        if isinstance(first, dict) and ("deleted" in first or isinstance(first.get("key"), str)):
+            # A log line; avoids decoding (or copying out of an mmap) the whole log
+            return False
+        try:
+            store = json.loads(bytes(data))
+        except ValueError:
+            # Several log lines ("Extra data") or not JSON at all
+            return False
+        # A one-line log also parses, but its "key" field holds a string, not an entry
+        return isinstance(store, dict) and all(isinstance(v, dict) for v in store.values())
+
+    def _load_legacy(self, data: bytes) -> None:
+        """Import a legacy store and rewrite it as a log."""
+        store = json.loads(data)
+        self._store = {
+            key: {"key": key, "value": entry.get("value"), "expiry": entry.get("expiry", 0)}
+            for key, entry in store.items()
+        }
+        self._compact()
 
-    def _save_store(self, store: Dict[str, Dict[str, Any]]) -> None:
-        """Save store to disk."""
+    def _append(self, *entries: Dict[str, Any]) -> bytes:
+        """Append entries to the log and return the bytes written. Must be called with the lock held."""
+        data = b"".join(dumps(entry) + b"\n" for entry in entries)
         try:
-            # Create parent directory if it doesn't exist
-            self.storage_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(store, f, indent=2)
+            fd = os.open(self.storage_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # A single O_APPEND write keeps the batch contiguous for lock-free readers
+                written = os.write(fd, data)
+                while written < len(data):
+                    written += os.write(fd, data[written:])
+                offset = os.lseek(fd, 0, os.SEEK_CUR) - len(data)
+                inode = os.fstat(fd).st_ino
+            finally:
+                os.close(fd)
+        except Exception as e:
+            raise RuntimeError(f"Failed to save response store: {e}") from e
+        if inode == self._inode and offset == self._offset:
+            self._offset += len(data)
+            self._lines += len(entries)
+        return data
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the log once dead lines (overwrites, tombstones) outnumber live ones."""
+        if self._lines - len(self._store) > len(self._store):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Atomically rewrite the log with only the live, unexpired entries. Must be called with the lock held."""
+        now = time.time()
+        self._store = {k: e for k, e in self._store.items() if e["expiry"] >= now}
+        data = b"".join(dumps(entry) + b"\n" for entry in self._store.values())
+        tmp_file = self.storage_file.with_name(self.storage_file.name + ".tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                inode = os.fstat(f.fileno()).st_ino
+            os.replace(tmp_file, self.storage_file)
         except Exception as e:
             raise RuntimeError(f"Failed to save response store: {e}") from e
+        self._inode = inode
+        self._offset = len(data)
+        self._lines = len(self._store)
 
     def set(self, key: str, value: Any, ttl_seconds: int = 60) -> None:
         """Store a response value with optional TTL."""
         try:
             self._acquire_lock()
-            store = self._load_store()
-            
-            # Serialize value to JSON string
-            if not isinstance(value, str):
-                value_str = json.dumps(value)
-            else:
-                value_str = value
-            
+            self._load_store()
+
             # Use default TTL if 0 is provided (matching interface behavior)
             ttl = ttl_seconds if ttl_seconds > 0 else 3600
-            expiry = time.time() + ttl
-            
-            store[key] = {
-                "value": value_str,
-                "expiry": expiry
-            }
-            
-            self._save_store(store)
+            # The value goes into the log line as-is, encoded once with the line
+            entry = {"key": key, "data": value, "expiry": time.time() + ttl}
+            # Cache the decoded line, not the caller's object: get() then returns
+            # what any other reader of the log sees, and later mutations of value
+            # do not leak into the store
+            self._apply(loads(self._append(entry)))
+            self._sets_since_vacuum += 1
+            if self._sets_since_vacuum >= self.VACUUM_INTERVAL:
+                self._vacuum()
+            else:
+                self._maybe_compact()
         finally:
             self._release_lock()
 
     def get(self, key: str) -> Optional[Any]:
-        """Retrieve a response value if it exists and hasn't expired."""
+        """
+        Retrieve a response value if it exists and hasn't expired.
+
+        Read-only: an expired entry reads as None but stays in the log until
+        vacuum() or a compaction during set()/delete() drops it.
+        """
+        # Misses and fresh entries are answered from the log without the file lock
+        store = self._load_store()
+        if self._legacy_pending:
+            try:
+                self._acquire_lock()
+                store = self._load_store()
+            finally:
+                self._release_lock()
+
+        entry = store.get(key)
+        if entry is None:
+            return None
+        # Expired entries read as missing; vacuum() removes them from the log
+        if time.time() > entry.get("expiry", 0):
+            return None
+
+        if "data" in entry:
+            return entry["data"]
+        # Older entries hold a JSON-encoded string; return it as-is if it is not JSON
+        value_str = entry.get("value")
+        try:
+            return json.loads(value_str)
+        except (json.JSONDecodeError, TypeError):
+            return value_str
+
+    def vacuum(self) -> int:
+        """Remove expired entries from the log and return how many were removed."""
         try:
             self._acquire_lock()
-            store = self._load_store()
-            
-            if key not in store:
-                return None
-            
-            entry = store[key]
-            value_str = entry.get("value")
-            expiry = entry.get("expiry", 0)
-            
-            # Check if expired
-            if time.time() > expiry:
-                del store[key]
-                self._save_store(store)
-                return None
-            
-            # Try to deserialize JSON, return as-is if it fails
-            try:
-                return json.loads(value_str)
-            except (json.JSONDecodeError, TypeError):
-                return value_str
+            self._load_store()
+            return self._vacuum()
         finally:
             self._release_lock()
 
+    def _vacuum(self) -> int:
+        """Body of vacuum(); the caller holds the lock and has loaded the store."""
+        self._sets_since_vacuum = 0
+        now = time.time()
+        expired = sum(1 for entry in self._store.values() if now > entry.get("expiry", 0))
+        if expired:
+            # Compaction keeps only unexpired entries
+            self._compact()
+        return expired
+
     def delete(self, key: str) -> None:
         """Delete a response value."""
+        if not self.storage_file.exists():
+            # Nothing was ever stored; skip opening and locking the lock file
+            return
         try:
             self._acquire_lock()
             store = self._load_store()
             if key in store:
+                self._append({"deleted": key})
                 del store[key]
-                self._save_store(store)
+                self._maybe_compact()
         finally:
             self._release_lock()
-
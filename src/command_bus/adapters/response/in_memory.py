@@ -1,42 +1,115 @@
 """In-memory response store for tests or in-process request/response."""
 
-import json
+import asyncio
+import heapq
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ...interfaces import ResponseStore
 
 
 class InMemoryResponseStore(ResponseStore):
-    """Simple in-memory response store."""
+    """
+    Simple in-memory response store. Values are kept as-is; nothing is serialized.
+
+    Expiry uses time.monotonic(), so wall-clock jumps do not expire or revive
+    entries. Entries that are never read again are reclaimed by a bounded sweep
+    of an expiry heap on every set() and get().
+
+    wait_async() lets execute() sleep until set() stores the key instead of
+    polling, even when the worker is a different bus sharing this store.
+    """
+
+    # Most expired entries reclaimed per call; keeps a single call cheap
+    SWEEP_BATCH = 64
 
     def __init__(self, default_ttl_seconds: int = 3600) -> None:
-        self._store: Dict[str, tuple] = {}  # key -> (value, timestamp)
+        self._store: Dict[str, Tuple[Any, float]] = {}  # key -> (value, expiry)
+        # (expiry, key) for every set(); stale pairs (overwritten or deleted keys) are skipped
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._default_ttl = default_ttl_seconds
+        # Futures of wait_async() calls, by key; resolved by set()
+        self._key_waiters: Dict[str, List["asyncio.Future[None]"]] = {}
+
+    def _sweep(self, now: float) -> None:
+        """Drop up to SWEEP_BATCH entries that expired by now."""
+        heap = self._expiry_heap
+        for _ in range(self.SWEEP_BATCH):
+            if not heap or heap[0][0] > now:
+                break
+            expiry, key = heapq.heappop(heap)
+            item = self._store.get(key)
+            if item is not None and item[1] == expiry:
+                del self._store[key]
+        if len(heap) > 2 * len(self._store) + self.SWEEP_BATCH:
+            # Mostly stale pairs from overwrites and deletes; rebuild from the live entries
+            self._expiry_heap = [(expiry, key) for key, (_, expiry) in self._store.items()]
+            heapq.heapify(self._expiry_heap)
 
     def set(self, key: str, value: Any, ttl_seconds: int = 60) -> None:
         """Store a response value with optional TTL."""
-        # Serialize if not already a string
-        if not isinstance(value, str):
-            value = json.dumps(value)
+        now = time.monotonic()
+        self._sweep(now)
         # Use default TTL if 0 is provided (matching interface behavior)
         ttl = ttl_seconds if ttl_seconds > 0 else self._default_ttl
-        self._store[key] = (value, time.time() + ttl)
+        expiry = now + ttl
+        self._store[key] = (value, expiry)
+        heapq.heappush(self._expiry_heap, (expiry, key))
+        waiters = self._key_waiters.pop(key, None)
+        if waiters:
+            _wake(waiters)
+
+    async def wait_async(self, key: str, timeout_seconds: float) -> Optional[Any]:
+        """Return the value for key once set() stores it, or None after timeout_seconds."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self._key_waiters.setdefault(key, [])
+        waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout_seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters and self._key_waiters.get(key) is waiters:
+                    del self._key_waiters[key]
+        return self.get(key)
 
     def get(self, key: str) -> Optional[Any]:
         """Retrieve a response value if it exists and hasn't expired."""
-        if key not in self._store:
+        now = time.monotonic()
+        self._sweep(now)
+        item = self._store.get(key)
+        if item is None:
             return None
-        value, expiry = self._store[key]
-        if time.time() > expiry:
+        value, expiry = item
+        if now > expiry:
             del self._store[key]
             return None
-        # Try to deserialize JSON, return as-is if it fails
-        try:
-            return json.loads(value)
-        except (json.JSONDecodeError, TypeError):
-            return value
+        return value
 
     def delete(self, key: str) -> None:
         """Delete a response value."""
         self._store.pop(key, None)
+
+
+def _resolve(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _wake(waiters: List["asyncio.Future[None]"]) -> None:
+    """Resolve waiters, each on its own loop (set() may run in another thread)."""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    for waiter in waiters:
+        loop = waiter.get_loop()
+        if loop is running:
+            _resolve(waiter)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(_resolve, waiter)
@@ -1,56 +1,120 @@
 """Redis-backed response store for request/response over the command bus."""
 
-import json
-from typing import Any, Optional
+import math
+import time
+from typing import Any, Iterable, List, Optional, Tuple
 
+from ..._json import dumps, loads
 from ...interfaces import ResponseStore
 
 
-def _serialize(value: Any) -> str:
+def _default(value: Any) -> Any:
+    """Models nested in a result are dumped; anything else unknown is stored as str()."""
     if hasattr(value, "model_dump"):
-        value = value.model_dump()
-    return json.dumps(value, default=str)
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def _serialize(value: Any) -> bytes:
+    if hasattr(value, "model_dump_json"):
+        # Encoded by pydantic-core directly, without an intermediate dict
+        return value.model_dump_json().encode("utf-8")
+    return dumps(value, default=_default)
+
+
+# Pushed by set() to wake wait(); the value itself is read back with GET
+_WAKE_MARKER = b"1"
 
 
 def _deserialize(raw: Optional[bytes]) -> Optional[Any]:
     if raw is None:
         return None
-    if isinstance(raw, bytes):
-        raw = raw.decode("utf-8")
-    return json.loads(raw)
+    # Both orjson and json accept bytes, so there is no separate decode step
+    return loads(raw)
 
 
 class RedisResponseStore(ResponseStore):
     """
     Store handler results in Redis keyed by correlation_id.
     Use with CommandBus(response_store=...) and execute_and_wait() on the client.
-    Values are JSON-serialized; Pydantic models are stored via model_dump().
+    Values are JSON-serialized (with orjson when installed) and written as
+    bytes; Pydantic models are stored via model_dump_json().
+
+    set() also pushes a one-byte marker onto a short-lived list next to the
+    key, so wait() can block on it with BLPOP and wake on the first write
+    instead of polling GET.
+
+    BLPOP takes fractional timeouts from Redis 6 on. Pass
+    whole_second_timeouts=True for older servers: wait() then blocks for
+    whole seconds only and sleeps out a sub-second remainder before a GET.
     """
 
     def __init__(
         self,
-        redis_client: Any,  # e.g. redis.Redis() with .set(key, value, ex=ttl), .get(key), .delete(key)
+        redis_client: Any,  # e.g. redis.Redis(): .pipeline(), .get(), .mget(), .blpop(), .delete()
         key_prefix: str = "event_bus:response:",
         default_ttl_seconds: int = 60,
+        whole_second_timeouts: bool = False,
     ) -> None:
         self._redis = redis_client
         self._prefix = key_prefix
         self._default_ttl = default_ttl_seconds
+        self._whole_second_timeouts = whole_second_timeouts
 
     def _key(self, key: str) -> str:
         return f"{self._prefix}{key}"
 
+    def _channel(self, key: str) -> str:
+        return f"{self._key(key)}:chan"
+
     def set(self, key: str, value: Any, ttl_seconds: int = 0) -> None:
-        full_key = self._key(key)
-        payload = _serialize(value)
-        if ttl_seconds <= 0:
-            ttl_seconds = self._default_ttl
-        self._redis.set(full_key, payload, ex=ttl_seconds)
+        self.set_many([(key, value, ttl_seconds)])
+
+    def set_many(self, items: Iterable[Tuple[str, Any, int]]) -> None:
+        """Store several (key, value, ttl_seconds) items, with their wait() pushes, in one round-trip."""
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value, ttl_seconds in items:
+            payload = _serialize(value)
+            if ttl_seconds <= 0:
+                ttl_seconds = self._default_ttl
+            channel = self._channel(key)
+            pipe.set(self._key(key), payload, ex=ttl_seconds)
+            pipe.lpush(channel, _WAKE_MARKER)
+            pipe.expire(channel, ttl_seconds)
+        pipe.execute()
 
     def get(self, key: str) -> Optional[Any]:
         full_key = self._key(key)
         raw = self._redis.get(full_key)
         return _deserialize(raw)
 
+    def get_many(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        """Return the values for keys, in order, with a single MGET."""
+        full_keys = [self._key(key) for key in keys]
+        if not full_keys:
+            return []
+        return [_deserialize(raw) for raw in self._redis.mget(full_keys)]
+
+    def wait(self, key: str, timeout_seconds: float) -> Optional[Any]:
+        """
+        Block until a value is set for key or timeout_seconds pass; return it or None.
+
+        Never blocks past timeout_seconds. The BLPOP timeout is rounded up to
+        whole milliseconds, since Redis would read a smaller one as 0 (block
+        forever).
+        """
+        if self._whole_second_timeouts:
+            timeout = math.floor(timeout_seconds)
+            if timeout < 1:
+                time.sleep(max(timeout_seconds, 0))
+                return self.get(key)
+        else:
+            timeout = math.ceil(timeout_seconds * 1000) / 1000
+            if timeout <= 0:
+                return self.get(key)
+        if self._redis.blpop([self._channel(key)], timeout=timeout) is None:
+            return None
+        return self.get(key)
+
     def delete(self, key: str) -> None:
         self._redis.delete(self._key(key))
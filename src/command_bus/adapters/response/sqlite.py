@@ -0,0 +1,150 @@
+"""SQLite response store for persistent cross-process request/response."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+from ..._json import dumps, loads
+from ...interfaces import ResponseStore
+from .._storage import default_storage_dir
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses ("
+    "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL"
+    ") WITHOUT ROWID"
+)
+
+# Stays well under SQLite's limit on bound parameters per statement
+_MAX_KEYS_PER_SELECT = 500
+
+
+class SqliteResponseStore(ResponseStore):
+    """
+    Response store backed by a SQLite database in WAL mode.
+
+    An alternative to FileResponseStore when many keys are live at once:
+    set(), get() and delete() touch one B-tree row instead of replaying or
+    compacting a log. Values are JSON-encoded (with orjson when installed);
+    Pydantic models are stored as their JSON-mode dump. Expiry uses wall-clock
+    time so every process sharing the database agrees on it, and expired rows
+    are purged in bulk every PURGE_INTERVAL writes.
+    """
+
+    # Writes between bulk deletes of expired rows
+    PURGE_INTERVAL = 256
+
+    def __init__(
+        self,
+        database: Optional[Path] = None,
+        default_ttl_seconds: int = 3600,
+        timeout_seconds: float = 5.0,
+    ) -> None:
+        """
+        Initialize SQLite response store.
+
+        Args:
+            database: Path to the SQLite database. Defaults to ~/.qubot/responses.db
+            default_ttl_seconds: TTL used when set() is called with ttl_seconds=0
+            timeout_seconds: How long a write waits for another process's lock
+        """
+        if database is None:
+            database = default_storage_dir() / "responses.db"
+        self.database = Path(database)
+        self.database.parent.mkdir(parents=True, exist_ok=True)
+        self._default_ttl = default_ttl_seconds
+        # One connection shared by every thread, serialized by the lock;
+        # isolation_level=None leaves transactions to explicit BEGIN/COMMIT
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.database),
+            timeout=timeout_seconds,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps committed data safe on a crash; only a power loss can drop the last writes
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._writes = 0
+
+    def _expiry(self, ttl_seconds: int, now: float) -> float:
+        # Use default TTL if 0 is provided (matching interface behavior)
+        return now + (ttl_seconds if ttl_seconds > 0 else self._default_ttl)
+
+    def _maybe_purge(self, writes: int, now: float) -> None:
+        """Delete expired rows once every PURGE_INTERVAL writes. Must be called with the lock held."""
+        self._writes += writes
+        if self._writes >= self.PURGE_INTERVAL:
+            self._writes = 0
+            self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+
+    def set(self, key: str, value: Any, ttl_seconds: int = 60) -> None:
+        """Store a response value with optional TTL."""
+        self.set_many([(key, value, ttl_seconds)])
+
+    def set_many(self, items: Iterable[Tuple[str, Any, int]]) -> None:
+        """Store several (key, value, ttl_seconds) items in one transaction."""
+        now = time.time()
+        rows = [(key, dumps(value), self._expiry(ttl, now)) for key, value, ttl in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._maybe_purge(len(rows), now)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retrieve a response value if it exists and hasn't expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if now > expires_at:
+                # Re-checked in SQL so a concurrent fresh set() is not deleted
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key = ? AND expires_at < ?", (key, now)
+                )
+                return None
+        return loads(value)
+
+    def get_many(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        """Return the values for keys, in order, with one SELECT per 500 keys."""
+        keys = list(keys)
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_KEYS_PER_SELECT):
+                chunk = keys[i : i + _MAX_KEYS_PER_SELECT]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    (key, value)
+                    for key, value in self._conn.execute(
+                        f"SELECT key, value FROM responses WHERE key IN ({placeholders}) AND expires_at >= ?",
+                        (*chunk, now),
+                    )
+                )
+        return [loads(found[key]) if key in found else None for key in keys]
+
+    def delete(self, key: str) -> None:
+        """Delete a response value."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
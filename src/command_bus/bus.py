@@ -2,16 +2,37 @@
 
 import asyncio
 import logging
+import random
+import sys
 import time
 import uuid
-from typing import Any, Optional, Type
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
 
-from .interfaces import CommandBusAdapter, CommandBusInterface, CommandMessage, ResponseStore
+from .interfaces import (
+    CommandBusAdapter,
+    CommandBusInterface,
+    CommandHandler,
+    CommandMessage,
+    ResponseStore,
+)
 from .parsers import MessageParserBase, ReprMessageParser
-from .registry import CommandBusRouter
+from .registry import CommandBusRouter, CommandBusRouterEntry
 
 logger = logging.getLogger(__name__)
 
+# First poll delay in execute(wait=True); doubles (with jitter) up to poll_interval_seconds
+_INITIAL_POLL_SECONDS = 0.001
+
+
+if sys.version_info >= (3, 12):
+    def _start(coro: Any) -> "asyncio.Task[Any]":
+        """Start coro eagerly: one that finishes without suspending (sync handlers) never waits for the loop."""
+        return asyncio.Task(coro, loop=asyncio.get_running_loop(), eager_start=True)
+else:
+    _start = asyncio.ensure_future
+
 
 class CommandBus(CommandBusInterface):
     """
@@ -25,6 +46,23 @@ class CommandBus(CommandBusInterface):
 
     response_store is optional; when set, the bus can store handler return values
     keyed by correlation_id so clients can use execute_and_wait() to get results.
+    When the same bus (e.g. a worker task in the client's process) dispatches the
+    command, the waiting client is woken as soon as the result is stored instead
+    of on its next poll. A store with an async wait_async(key, timeout_seconds)
+    method (like InMemoryResponseStore) is awaited directly instead of polled.
+    Otherwise results from other processes are found by polling, or, when the
+    store has a blocking wait(key, timeout_seconds) method (like
+    RedisResponseStore), by blocking on it in a worker thread. Those threads
+    come from the bus's own pool of max_blocking_waits threads, not the loop's
+    default executor; waiters beyond that poll until a thread frees up.
+
+    With parallel_handlers=True, dispatch() runs all handlers registered for a
+    message concurrently instead of one after another. Leave it off when
+    handlers rely on running in registration order.
+
+    work() dispatches the messages of one get_messages() batch concurrently
+    (at most max_concurrency at a time, when set) and acknowledges the ones
+    that succeeded with a single dequeue_batch() call.
     """
 
     def __init__(
@@ -34,7 +72,15 @@ class CommandBus(CommandBusInterface):
         message_parser_class: Optional[Type[MessageParserBase]] = None,
         response_store: Optional[ResponseStore] = None,
         response_ttl_seconds: int = 60,
+        parallel_handlers: bool = False,
+        max_concurrency: Optional[int] = None,
+        max_blocking_waits: int = 8,
     ) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            # work() would start no dispatchers and then acknowledge the whole batch
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if max_blocking_waits < 1:
+            raise ValueError(f"max_blocking_waits must be at least 1, got {max_blocking_waits}")
         self.queue_adapter = queue_adapter
         self.registry = (
             command_router if command_router is not None else CommandBusRouter()
@@ -42,6 +88,22 @@ class CommandBus(CommandBusInterface):
         self.message_parser_class = message_parser_class or ReprMessageParser
         self.response_store = response_store
         self.response_ttl_seconds = response_ttl_seconds
+        self.parallel_handlers = parallel_handlers
+        self.max_concurrency = max_concurrency
+        # Parsers reused across dispatch() calls via MessageParserBase.reset()
+        self._parser_pool: "deque[MessageParserBase]" = deque(maxlen=32)
+        # Router entries per message class, each with its shared handler
+        # instance (reuse_instance entries) or None; valid while registry.version is unchanged
+        self._handler_cache: Dict[
+            type, Tuple[Tuple[CommandBusRouterEntry, Optional[CommandHandler]], ...]
+        ] = {}
+        self._handler_cache_version: Optional[int] = None
+        # Futures for in-flight execute(wait=True) calls, keyed by correlation_id
+        self._waiters: Dict[str, "asyncio.Future[None]"] = {}
+        # Threads for blocking response_store.wait() calls, created on first use
+        self.max_blocking_waits = max_blocking_waits
+        self._wait_executor: Optional[ThreadPoolExecutor] = None
+        self._blocking_waits = 0
 
     def _enqueue(
         self,
@@ -70,6 +132,9 @@ class CommandBus(CommandBusInterface):
         and return the handler result). Pass wait=False for fire-and-forget.
         When no response_store is set, wait is ignored and the command is only enqueued.
 
+        With wait=True a copy of message_instance carrying a new
+        correlation_id is enqueued; message_instance itself is not changed.
+
         Returns the handler result when wait=True, None otherwise.
         """
         delay = 0 if delay_seconds is None else delay_seconds
@@ -82,27 +147,91 @@ class CommandBus(CommandBusInterface):
                     "execute(..., wait=True) requires a response_store on the bus"
                 )
             correlation_id = str(uuid.uuid4())
-            message_with_id = message_instance.model_copy(
-                update={"correlation_id": correlation_id}
-            )
-            self._enqueue(message_with_id, delay_seconds=delay)
-            ttl = (
-                response_ttl_seconds
-                if response_ttl_seconds is not None
-                else self.response_ttl_seconds
-            )
-            deadline = time.monotonic() + timeout_seconds
-            while time.monotonic() < deadline:
-                result = self.response_store.get(correlation_id)
-                if result is not None:
-                    return result
-                await asyncio.sleep(poll_interval_seconds)
+            message_with_id = self._with_correlation_id(message_instance, correlation_id)
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            async_wait = getattr(self.response_store, "wait_async", None)
+            blocking_wait = getattr(self.response_store, "wait", None)
+            self._waiters[correlation_id] = waiter
+            try:
+                self._enqueue(message_with_id, delay_seconds=delay)
+                ttl = (
+                    response_ttl_seconds
+                    if response_ttl_seconds is not None
+                    else self.response_ttl_seconds
+                )
+                deadline = time.monotonic() + timeout_seconds
+                backoff = _INITIAL_POLL_SECONDS
+                while True:
+                    result = self.response_store.get(correlation_id)
+                    if result is not None:
+                        return result
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if async_wait is not None:
+                        # The store wakes this call itself; no intermediate polls
+                        result = await async_wait(correlation_id, remaining)
+                        if result is not None:
+                            return result
+                        continue
+                    if blocking_wait is not None and self._blocking_waits < self.max_blocking_waits:
+                        self._blocking_waits += 1
+                        try:
+                            result = await loop.run_in_executor(
+                                self._blocking_wait_executor(),
+                                blocking_wait,
+                                correlation_id,
+                                min(poll_interval_seconds, remaining),
+                            )
+                        finally:
+                            self._blocking_waits -= 1
+                        if result is not None:
+                            return result
+                        continue
+                    # Fast handlers are picked up within milliseconds; the +/-25%
+                    # jitter keeps many waiting clients from polling in lockstep
+                    interval = min(backoff * random.uniform(0.75, 1.25), poll_interval_seconds, remaining)
+                    backoff = min(backoff * 2, poll_interval_seconds)
+                    if waiter.done():
+                        # Already woken but the store had nothing; plain polling from here
+                        await asyncio.sleep(interval)
+                        continue
+                    try:
+                        # Returns early when dispatch() on this bus stores the result
+                        await asyncio.wait_for(asyncio.shield(waiter), interval)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiters.pop(correlation_id, None)
             raise TimeoutError(
                 f"No response for correlation_id {correlation_id} within {timeout_seconds}s"
             )
         self._enqueue(message_instance, delay_seconds=delay)
         return None
 
+    def _blocking_wait_executor(self) -> ThreadPoolExecutor:
+        """Return the pool that runs blocking response_store.wait() calls."""
+        if self._wait_executor is None:
+            self._wait_executor = ThreadPoolExecutor(
+                max_workers=self.max_blocking_waits,
+                thread_name_prefix="command-bus-wait",
+            )
+        return self._wait_executor
+
+    @staticmethod
+    def _with_correlation_id(
+        message_instance: CommandMessage, correlation_id: str
+    ) -> CommandMessage:
+        """
+        Return a copy of message_instance carrying correlation_id.
+
+        The caller's message is left as it was, so reusing it later cannot
+        send a stale id. model_copy() skips validation and keeps extra
+        fields (extra='allow') and private attributes.
+        """
+        return message_instance.model_copy(update={"correlation_id": correlation_id})
+
     async def execute_and_wait(
         self,
         message_instance: CommandMessage,
@@ -121,24 +250,117 @@ class CommandBus(CommandBusInterface):
             response_ttl_seconds=response_ttl_seconds,
         )
 
+    async def execute_and_wait_many(
+        self,
+        message_instances: Iterable[CommandMessage],
+        timeout_seconds: float = 30.0,
+        poll_interval_seconds: float = 0.5,
+        delay_seconds: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Enqueue several commands with one enqueue_many() and wait for all results.
+
+        Outstanding results are fetched with one response_store.get_many() per
+        poll (a single MGET on RedisResponseStore) instead of a get() per
+        command. Returns the results in message order; raises TimeoutError if
+        any is still missing after timeout_seconds. As with execute(), each
+        command is enqueued as a copy carrying its own correlation_id.
+        """
+        if self.response_store is None:
+            raise ValueError("execute_and_wait_many() requires a response_store on the bus")
+        messages = [
+            self._with_correlation_id(message_instance, str(uuid.uuid4()))
+            for message_instance in message_instances
+        ]
+        for message_with_id in messages:
+            if not self.registry.get_handlers_for_message(message_with_id):
+                raise ValueError(f"No handler found for {message_with_id}")
+        if not messages:
+            return []
+        self.queue_adapter.enqueue_many(
+            messages, delay_seconds=0 if delay_seconds is None else delay_seconds
+        )
+
+        correlation_ids = [message_with_id.correlation_id for message_with_id in messages]
+        results: Dict[str, Any] = {}
+        deadline = time.monotonic() + timeout_seconds
+        backoff = _INITIAL_POLL_SECONDS
+        pending = list(correlation_ids)
+        while True:
+            values = self.response_store.get_many(pending)
+            for cid, result in zip(pending, values):
+                if result is not None:
+                    results[cid] = result
+            pending = [cid for cid, result in zip(pending, values) if result is None]
+            if not pending:
+                return [results[cid] for cid in correlation_ids]
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            interval = min(backoff * random.uniform(0.75, 1.25), poll_interval_seconds, remaining)
+            backoff = min(backoff * 2, poll_interval_seconds)
+            await asyncio.sleep(interval)
+        raise TimeoutError(
+            f"No response for {len(pending)} of {len(correlation_ids)} commands within {timeout_seconds}s"
+        )
+
     async def dispatch(self, raw_message: str) -> None:
         """Parse the raw message (using the configured parser), then run all registered handlers."""
-        parser = self.message_parser_class(raw_message)
-        command_instance = parser.initialize()
-        registry_entries = self.registry.get_handlers_for_message(command_instance)
-        logger.info("%d handlers found", len(registry_entries))
+        # Messages of a type nobody handles are dropped before parsing. Needs a
+        # router with handles() and a parser that can peek at the type; names
+        # the router cannot rule out (e.g. aliases) are parsed as usual.
+        handles = getattr(self.registry, "handles", None)
+        if handles is not None:
+            qual_name = self.message_parser_class.peek_qual_name(raw_message)
+            if qual_name is not None and not handles(qual_name):
+                logger.info("No handlers registered for %s; message skipped", qual_name)
+                return
+        command_instance = self._parse(raw_message)
+        handlers = self._handlers_for(type(command_instance))
+        # Checked once; the calls below are skipped entirely when INFO is off
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("%d handlers found", len(handlers))
 
         last_result: Any = None
-        for entry in registry_entries:
-            handler = entry.handler_instance()
-            result = await handler(command_instance)
-            if result is not None:
-                last_result = result
-            logger.info(
-                "Dispatched command %s to %s handler",
-                command_instance,
-                entry.handler_class,
+        if self.parallel_handlers and len(handlers) > 1:
+            results = await asyncio.gather(
+                *[_start(handler(command_instance)) for _, handler in handlers],
+                return_exceptions=True,
             )
+            errors = []
+            for (entry, _), result in zip(handlers, results):
+                if isinstance(result, BaseException):
+                    logger.error(
+                        "Handler %s failed for command %s",
+                        entry.handler_class,
+                        command_instance,
+                        exc_info=result,
+                    )
+                    errors.append(result)
+                    continue
+                if result is not None:
+                    last_result = result
+                if log_info:
+                    logger.info(
+                        "Dispatched command %s to %s handler",
+                        command_instance,
+                        entry.handler_class,
+                    )
+            if errors:
+                # Same as the sequential path: the message is not acknowledged
+                raise errors[0]
+        else:
+            for entry, handler in handlers:
+                result = await handler(command_instance)
+                if result is not None:
+                    last_result = result
+                if log_info:
+                    logger.info(
+                        "Dispatched command %s to %s handler",
+                        command_instance,
+                        entry.handler_class,
+                    )
 
         if (
             command_instance.correlation_id
@@ -150,10 +372,113 @@ class CommandBus(CommandBusInterface):
                 last_result,
                 ttl_seconds=self.response_ttl_seconds,
             )
+            self._wake_waiter(command_instance.correlation_id)
+
+    def _parse(self, raw_message: str) -> CommandMessage:
+        """Parse raw_message with a pooled parser, creating one when the pool is empty."""
+        try:
+            parser = self._parser_pool.pop()
+        except IndexError:
+            parser = None
+        if type(parser) is not self.message_parser_class:
+            # Empty pool, or message_parser_class was swapped since the parser was made
+            parser = self.message_parser_class(raw_message)
+        else:
+            parser.reset(raw_message)
+        try:
+            return parser.initialize()
+        finally:
+            self._parser_pool.append(parser)
+
+    def _handlers_for(
+        self, message_class: type
+    ) -> Tuple[Tuple[CommandBusRouterEntry, CommandHandler], ...]:
+        """
+        Return (router entry, handler instance) pairs for message_class.
+
+        The router lookup is cached per class and dropped whenever the
+        router's version changes (register() or deregister()); routers without
+        a version are asked every time. Handlers get a fresh instance per
+        dispatch, since concurrent dispatches must not share per-message state,
+        unless their entry has reuse_instance set: those share one instance
+        while the cache is valid.
+        """
+        version = getattr(self.registry, "version", None)
+        if version is None:
+            entries = self._resolve_handlers(message_class)
+        else:
+            if version != self._handler_cache_version:
+                self._handler_cache.clear()
+                self._handler_cache_version = version
+            entries = self._handler_cache.get(message_class)
+            if entries is None:
+                entries = self._resolve_handlers(message_class)
+                self._handler_cache[message_class] = entries
+        return tuple(
+            (entry, shared if shared is not None else entry.handler_instance())
+            for entry, shared in entries
+        )
+
+    def _resolve_handlers(
+        self, message_class: type
+    ) -> Tuple[Tuple[CommandBusRouterEntry, Optional[CommandHandler]], ...]:
+        return tuple(
+            (entry, entry.handler_instance() if getattr(entry, "reuse_instance", False) else None)
+            for entry in self.registry.get_handlers_for_message(message_class)
+        )
+
+    def _wake_waiter(self, correlation_id: str) -> None:
+        """Wake an execute() call on this bus that is waiting for correlation_id."""
+        waiter = self._waiters.get(correlation_id)
+        if waiter is None or waiter.done():
+            return
+        loop = waiter.get_loop()
+        try:
+            same_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            same_loop = False
+        if same_loop:
+            waiter.set_result(None)
+        else:
+            loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
 
     async def work(self) -> None:
-        """Poll the queue and dispatch each message to its handlers."""
-        messages = self.queue_adapter.get_messages()
-        for message in messages:
-            await self.dispatch(message.body)
-            self.queue_adapter.dequeue(message)
+        """
+        Poll the queue and dispatch each message to its handlers.
+
+        Messages whose handlers fail are left on the queue (to be redelivered
+        by the backend); the first failure is re-raised once the rest of the
+        batch has been dispatched and acknowledged.
+        """
+        messages = list(self.queue_adapter.get_messages())
+        if not messages:
+            return
+        if len(messages) == 1:
+            await self.dispatch(messages[0].body)
+            self.queue_adapter.dequeue(messages[0])
+            return
+
+        if self.max_concurrency and self.max_concurrency < len(messages):
+            # max_concurrency workers share one iterator over the batch, so only
+            # that many tasks exist however large the batch is
+            results: List[Any] = [None] * len(messages)
+            pending = iter(enumerate(messages))
+
+            async def drain() -> None:
+                for i, message in pending:
+                    try:
+                        await self.dispatch(message.body)
+                    except Exception as e:
+                        results[i] = e
+
+            await asyncio.gather(*[_start(drain()) for _ in range(self.max_concurrency)])
+        else:
+            results = await asyncio.gather(
+                *[_start(self.dispatch(m.body)) for m in messages], return_exceptions=True
+            )
+        done = [m for m, r in zip(messages, results) if not isinstance(r, BaseException)]
+        if done:
+            self.queue_adapter.dequeue_batch(done)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
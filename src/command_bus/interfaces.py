@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from asyncio import iscoroutine
-from typing import Any, Coroutine, List, Optional, Type, Union
+from typing import Any, Coroutine, Iterable, List, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel
 
@@ -46,16 +46,39 @@ class ResponseStore(ABC):
         """Remove the key from the store."""
         ...
 
+    def set_many(self, items: Iterable[Tuple[str, Any, int]]) -> None:
+        """Store several (key, value, ttl_seconds) items. Override when the backend can batch writes."""
+        for key, value, ttl_seconds in items:
+            self.set(key, value, ttl_seconds=ttl_seconds)
+
+    def get_many(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        """Return the values for keys, in order (None where missing or expired)."""
+        return [self.get(key) for key in keys]
+
 
 class CommandBusAdapter(ABC):
     @abstractmethod
     def enqueue(self, message_instance: CommandMessage, delay_seconds: int = 0) -> None:
         pass
 
+    def enqueue_many(
+        self,
+        message_instances: Iterable[CommandMessage],
+        delay_seconds: int = 0,
+    ) -> None:
+        """Enqueue several messages. Override when the backend can batch writes."""
+        for message_instance in message_instances:
+            self.enqueue(message_instance, delay_seconds=delay_seconds)
+
     @abstractmethod
     def dequeue(self, message_instance: Any) -> None:
         pass
 
+    def dequeue_batch(self, message_instances: Iterable[Any]) -> None:
+        """Dequeue several messages. Override when the backend can batch acks/deletes."""
+        for message_instance in message_instances:
+            self.dequeue(message_instance)
+
     @abstractmethod
     def get_messages(self, *args: Any, **kwargs: Any) -> Any:
         pass
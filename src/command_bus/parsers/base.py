@@ -1,6 +1,7 @@
 """Abstract base for message parsers. Implement this to support different message formats."""
 
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from ..interfaces import CommandMessage
 
@@ -11,7 +12,32 @@ class MessageParserBase(ABC):
     Implement this to support different serialization formats (repr-style, JSON, etc.).
     """
 
+    def reset(self, message_string: str) -> None:
+        """
+        Point this parser at a new raw message so the instance can be reused.
+        Defaults to re-running __init__(message_string); override when __init__
+        takes other arguments that should be kept.
+        """
+        self.__init__(message_string)  # type: ignore[misc]
+
     @abstractmethod
     def initialize(self) -> CommandMessage:
         """Parse the raw message and return a CommandMessage instance."""
         ...
+
+    @classmethod
+    def peek_qual_name(cls, message_string: str) -> Optional[str]:
+        """
+        Return the qualified name of the message type without parsing the
+        message, or None when it cannot be read cheaply (the default).
+        The bus skips messages whose type has no handlers before parsing them.
+        """
+        return None
+
+    @classmethod
+    def serialize(cls, message_instance: CommandMessage) -> str:
+        """
+        Return the raw message form of message_instance that this parser reads back.
+        Defaults to str(message_instance) (the repr-style format).
+        """
+        return str(message_instance)
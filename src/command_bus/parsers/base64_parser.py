@@ -40,6 +40,10 @@ class Base64MessageParser(MessageParserBase):
         self._decompress = decompress
         self._inner_parser_kwargs = inner_parser_kwargs or {}
 
+    def reset(self, message_string: str) -> None:
+        """Point the parser at a new encoded message, keeping the inner parser settings."""
+        self._encoded = message_string
+
     def initialize(self) -> CommandMessage:
         """Decode (and optionally decompress), then parse with the inner parser."""
         decoded_bytes = base64.b64decode(self._encoded)
@@ -48,3 +52,9 @@ class Base64MessageParser(MessageParserBase):
         decoded_str = decoded_bytes.decode("utf-8")
         inner = self._inner_parser_class(decoded_str, **self._inner_parser_kwargs)
         return inner.initialize()
+
+    @classmethod
+    def serialize(cls, message_instance: CommandMessage) -> str:
+        """Return the repr-style form of message_instance, base64-encoded (uncompressed)."""
+        raw = ReprMessageParser.serialize(message_instance)
+        return base64.b64encode(raw.encode("utf-8")).decode("ascii")
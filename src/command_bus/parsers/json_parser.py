@@ -1,13 +1,40 @@
 """Parser for JSON message payloads."""
 
 import json
-from typing import Any, Dict
+import re
+from functools import lru_cache
+from typing import Any, Dict, Type, Union
 
+from .._json import JSONDecodeError, loads
 from ..interfaces import CommandMessage
-from ..utils import ModuleImporter
+from ..utils import get_module_importer
 from .base import MessageParserBase
 
 
+@lru_cache(maxsize=256)
+def _type_field(message_class: Type[CommandMessage]) -> str:
+    """Return the encoded "__type__" value for a class; producers repeat the same few types."""
+    return json.dumps(f"{message_class.__module__}.{message_class.__name__}")
+
+
+# orjson turns integers outside the 64-bit range (19+ digits) into floats;
+# payloads that might hold one are decoded with the stdlib instead
+_LONG_DIGITS = re.compile(r"\d{19}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19}")
+
+
+def _loads(message_string: Union[str, bytes]) -> Any:
+    """Decode with orjson when installed, keeping the stdlib's results for what orjson handles differently."""
+    pattern = _LONG_DIGITS_BYTES if isinstance(message_string, bytes) else _LONG_DIGITS
+    if pattern.search(message_string):
+        return json.loads(message_string)
+    try:
+        return loads(message_string)
+    except JSONDecodeError:
+        # The stdlib also accepts NaN/Infinity; it re-raises for invalid JSON
+        return json.loads(message_string)
+
+
 class JsonMessageParser(MessageParserBase):
     """
     Parses JSON strings into CommandMessage instances.
@@ -27,13 +54,21 @@ class JsonMessageParser(MessageParserBase):
         message_string: str,
         type_key: str = "__type__",
     ) -> None:
-        self._payload: Dict[str, Any] = json.loads(message_string)
         self._type_key = type_key
+        self.reset(message_string)
+
+    def reset(self, message_string: str) -> None:
+        """Parse a new JSON message, keeping the configured type key."""
+        payload = _loads(message_string)
+        # The type field is popped from the freshly decoded dict once here, so
+        # initialize() neither copies the payload nor rebuilds it without the key
+        self._type_value = payload.pop(self._type_key, None) if isinstance(payload, dict) else None
+        self._payload: Dict[str, Any] = payload
 
     def initialize(self) -> CommandMessage:
         """Parse the JSON and return a CommandMessage instance."""
-        payload = dict(self._payload)
-        type_value = payload.pop(self._type_key, None)
+        payload = self._payload
+        type_value = self._type_value
         if type_value is None:
             raise ValueError(
                 f"JSON message must contain a '{self._type_key}' field with the "
@@ -51,8 +86,18 @@ class JsonMessageParser(MessageParserBase):
                 "(e.g. mymodule.events.OrderCreated), got {type_value!r}"
             )
 
-        importer = ModuleImporter(module_path)
-        message_class = importer.get_class(class_name)
+        message_class = get_module_importer(module_path).get_class(class_name)
         if not issubclass(message_class, CommandMessage):
             raise ValueError(f"Class {type_value!r} is not a CommandMessage subclass")
         return message_class(**payload)
+
+    @classmethod
+    def serialize(cls, message_instance: CommandMessage) -> str:
+        """Return message_instance as a JSON object with a "__type__" field."""
+        type_field = _type_field(type(message_instance))
+        # Splice the type field into Pydantic's (Rust) JSON output rather than
+        # dumping to a dict and re-encoding it in Python
+        body = message_instance.model_dump_json()
+        if body == "{}":
+            return f'{{"__type__":{type_field}}}'
+        return f'{{"__type__":{type_field},{body[1:]}'
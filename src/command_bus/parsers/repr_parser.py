@@ -1,56 +1,195 @@
 """Parser for repr-style message strings: module.path.ClassName(args)."""
 
 import ast
-from typing import Any, Dict, List, Tuple
+import keyword
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..interfaces import CommandMessage
-from ..utils import ModuleImporter
+from ..utils import get_module_importer
 from .base import MessageParserBase
 
 
+@lru_cache(maxsize=1024)
+def _parse_call(args: str) -> ast.Call:
+    """
+    Parse an argument string into the ast.Call for f(args).
+
+    Cached because buses often see the same body many times (retries, fan-out);
+    the tree is only read, and values are built fresh from it on every call.
+    """
+    return ast.parse("f({})".format(args), mode="eval").body
+
+
+_NOT_CONSTANT = object()
+
+
+def _constant_value(node: ast.AST) -> Any:
+    """Value of a node built only from immutable literals, else _NOT_CONSTANT."""
+    node_type = type(node)
+    if node_type is ast.Constant:
+        return node.value
+    if node_type is ast.Name:
+        return _NAME_CONSTANTS.get(node.id, _NOT_CONSTANT)
+    if node_type is ast.UnaryOp and type(node.op) is ast.USub and type(node.operand) is ast.Constant:
+        value = node.operand.value
+        if isinstance(value, (int, float, complex)):
+            return -value
+    elif node_type is ast.Tuple:
+        values = tuple(_constant_value(e) for e in node.elts)
+        if not any(v is _NOT_CONSTANT for v in values):
+            return values
+    return _NOT_CONSTANT
+
+
+_WS = r"[ \t\r\n]*"
+# One name=value pair, where value is a literal simple enough to read without
+# ast: a quoted string with no escapes or line breaks, an int, a float, or a
+# name repr() emits for a constant. Ends at the separating comma or the end.
+_SIMPLE_KWARG = re.compile(
+    _WS
+    + r"([A-Za-z_][A-Za-z0-9_]*)"
+    + _WS + "=" + _WS
+    + r"('[^'\\\r\n\0]*'" + r'|"[^"\\\r\n\0]*"'
+    + r"|-?[0-9]+\.[0-9]+(?:e[+-][0-9]+)?|-?[0-9]+e[+-][0-9]+|-?(?:0|[1-9][0-9]*)"
+    + r"|None|True|False|nan)"
+    + _WS + r"(,|\Z)"
+)
+
+
+def _simple_kwargs(args: str) -> Optional[Tuple[Tuple[str, Any], ...]]:
+    """
+    kwargs items for an argument string of only name=literal pairs as
+    pydantic's repr writes them (e.g. "name='a', size=1"), read with a regex
+    instead of ast.parse. None for anything else, which ast then handles.
+    """
+    items = []
+    pos, end = 0, len(args)
+    while pos < end:
+        match = _SIMPLE_KWARG.match(args, pos)
+        if match is None:
+            if args[pos:].strip(" \t\r\n"):
+                return None
+            break
+        name, value, _ = match.groups()
+        if keyword.iskeyword(name):
+            return None
+        if value[0] in "'\"":
+            items.append((name, value[1:-1]))
+        elif value in _NAME_CONSTANTS:
+            items.append((name, _NAME_CONSTANTS[value]))
+        elif "." in value or "e" in value:
+            items.append((name, float(value)))
+        else:
+            items.append((name, int(value)))
+        pos = match.end()
+    if len({name for name, _ in items}) != len(items):
+        # A repeated keyword is a syntax error; let ast report it
+        return None
+    return tuple(items)
+
+
+@lru_cache(maxsize=4096)
+def _constant_args(args: str) -> Optional[Tuple[Tuple[Any, ...], Tuple[Tuple[str, Any], ...]]]:
+    """
+    (args, kwargs items) for an argument string made only of immutable
+    literals, or None when any value is mutable or needs a class lookup.
+
+    Those values are safe to share between messages, so the walk over the
+    tree is skipped entirely on repeats.
+    """
+    simple = _simple_kwargs(args)
+    if simple is not None:
+        return (), simple
+    funccall = _parse_call(args)
+    parsed_args = tuple(_constant_value(a) for a in funccall.args)
+    parsed_kwargs = tuple((k.arg, _constant_value(k.value)) for k in funccall.keywords)
+    if any(v is _NOT_CONSTANT for v in parsed_args) or any(
+        k is None or v is _NOT_CONSTANT for k, v in parsed_kwargs
+    ):
+        return None
+    return parsed_args, parsed_kwargs
+
+
 class ReprMessageParser(MessageParserBase):
     """
     Parses command message strings in the form:
     mymodule.MyMessage(1, x=2)
     into CommandMessage instances.
+
+    Argument strings made only of immutable literals (the common case) are
+    evaluated once and cached, so repeated bodies skip the AST walk. Plain
+    name=literal arguments, as pydantic's repr writes them, are read with a
+    regex instead of ast.parse. Pass cache_parsed=False for streams where
+    bodies rarely repeat.
     """
 
-    def __init__(self, message_string: str) -> None:
+    def __init__(self, message_string: str, cache_parsed: bool = True) -> None:
+        self.cache_parsed = cache_parsed
         (
             self.module_path,
             self.class_name,
             self.param_string,
         ) = self.get_message_components(message_string)
-        self.module_importer = ModuleImporter(self.module_path)
+        self.module_importer = get_module_importer(self.module_path)
+
+    def reset(self, message_string: str) -> None:
+        """Point the parser at a new message, keeping cache_parsed."""
+        self.__init__(message_string, cache_parsed=self.cache_parsed)
 
     @staticmethod
     def get_message_components(message_string: str) -> Tuple[str, str, str]:
         """
         Split message string into (module_path, class_name, param_string).
         """
-
-        def strip_last_parens(s: str) -> str:
-            pos = s.rfind(")")
+        module_name, paren, param_string = message_string.partition("(")
+        if not paren:
+            raise ValueError(f"Not a repr-style message: {message_string!r}")
+        # Drop the closing paren; usually the last character
+        if param_string.endswith(")"):
+            param_string = param_string[:-1]
+        else:
+            pos = param_string.rfind(")")
             if pos != -1:
-                s = s[:pos] + s[pos + 1 :]
-            return s
-
-        module_name, param_string = strip_last_parens(message_string).split("(", 1)
-        module_parts = module_name.split(".")
-        class_name = module_parts.pop(-1)
-        module_path = ".".join(module_parts)
+                param_string = param_string[:pos] + param_string[pos + 1 :]
+        module_path, _, class_name = module_name.rpartition(".")
         return module_path, class_name, param_string
 
+    @classmethod
+    def serialize(cls, message_instance: CommandMessage) -> str:
+        """
+        Return module.ClassName(field=value, ...) built from model_dump(), so
+        fields hidden from repr() with Field(repr=False) are kept.
+        """
+        message_class = type(message_instance)
+        args = ", ".join(f"{k}={v!r}" for k, v in message_instance.model_dump().items())
+        return f"{message_class.__module__}.{message_class.__name__}({args})"
+
+    @classmethod
+    def peek_qual_name(cls, message_string: str) -> Optional[str]:
+        """Return the module.ClassName prefix, or None when message_string is not repr-style."""
+        qual_name, paren, _ = message_string.partition("(")
+        return qual_name if paren else None
+
     def initialize(self) -> CommandMessage:
         """Create an instance of the message class with its parameters."""
+        message_class = self.module_importer.get_class(self.class_name)
+        if self.cache_parsed:
+            constant = _constant_args(self.param_string)
+            if constant is not None:
+                args, kwargs = constant
+                return message_class(*args, **dict(kwargs))
+        else:
+            simple = _simple_kwargs(self.param_string)
+            if simple is not None:
+                return message_class(**dict(simple))
         args, kwargs = self.parse_args(self.param_string)
-        return self.module_importer.get_class(self.class_name)(*args, **kwargs)
+        return message_class(*args, **kwargs)
 
     def parse_args(self, args: str) -> Tuple[List[Any], Dict[str, Any]]:
         """Parse a string of Python arguments into args and kwargs."""
-        args_str = "f({})".format(args)
-        tree = ast.parse(args_str)
-        funccall = tree.body[0].value
+        funccall = _parse_call(args)
 
         parsed_args = [self._eval_arg(arg) for arg in funccall.args]
         parsed_kwargs = {
@@ -60,36 +199,75 @@ class ReprMessageParser(MessageParserBase):
 
     def _eval_arg(self, arg: ast.AST) -> Any:
         """Convert an AST argument node to a Python value."""
-        if isinstance(arg, ast.Name):
-            if arg.id == "None":
-                return None
-            if arg.id == "True":
-                return True
-            if arg.id == "False":
-                return False
-            if arg.id == "nan":
-                return None
-            raise ValueError(f"Unsupported name: {arg.id}")
-
+        handler = _EVAL_HANDLERS.get(type(arg))
+        if handler is not None:
+            return handler(self, arg)
+        # Anything else (e.g. complex literals); literal_eval rejects non-literals
         try:
             return ast.literal_eval(arg)
         except (ValueError, SyntaxError):
-            if isinstance(arg, ast.Call):
-                module_name, _, class_str = arg.func.id.partition(".")
-                try:
-                    module_importer = ModuleImporter(module_name)
-                    class_ = module_importer.get_class(class_str)
-                except ImportError:
-                    class_ = self.module_importer.get_class(module_name)
-
-                call_args = [self._eval_arg(a) for a in arg.args]
-                call_kwargs = {k.arg: self._eval_arg(k.value) for k in arg.keywords}
-                return class_(*call_args, **call_kwargs)
-            if isinstance(arg, ast.List):
-                return [self._eval_arg(a) for a in arg.elts]
-            if isinstance(arg, ast.Dict):
-                return {
-                    self._eval_arg(k): self._eval_arg(v)
-                    for k, v in zip(arg.keys, arg.values)
-                }
-            raise ValueError(f"Unsupported arg type: {type(arg)}")
+            raise ValueError(f"Unsupported arg type: {type(arg)}") from None
+
+    def _eval_name(self, arg: ast.Name) -> Any:
+        try:
+            return _NAME_CONSTANTS[arg.id]
+        except KeyError:
+            raise ValueError(f"Unsupported name: {arg.id}") from None
+
+    def _eval_unary(self, arg: ast.UnaryOp) -> Any:
+        # Negative numbers parse as USub applied to a constant
+        operand = self._eval_arg(arg.operand)
+        if not isinstance(operand, (int, float, complex)):
+            raise ValueError(f"Unsupported operand: {operand!r}")
+        if type(arg.op) is ast.USub:
+            return -operand
+        if type(arg.op) is ast.UAdd:
+            return +operand
+        raise ValueError(f"Unsupported operator: {type(arg.op)}")
+
+    def _eval_call(self, arg: ast.Call) -> Any:
+        if type(arg.func) is not ast.Name:
+            raise ValueError(f"Unsupported call target: {type(arg.func)}")
+        builtin = _SET_TYPES.get(arg.func.id)
+        if builtin is not None and not arg.keywords and len(arg.args) <= 1:
+            # repr() of an empty set is set(); frozensets repr as frozenset({...})
+            return builtin(*(self._eval_arg(a) for a in arg.args))
+        module_name, _, class_str = arg.func.id.partition(".")
+        if not class_str:
+            # A bare class name: skip the doomed import of a module by that name
+            class_ = self.module_importer.get_class(module_name)
+        else:
+            try:
+                class_ = get_module_importer(module_name).get_class(class_str)
+            except ImportError:
+                class_ = self.module_importer.get_class(module_name)
+
+        call_args = [self._eval_arg(a) for a in arg.args]
+        call_kwargs = {k.arg: self._eval_arg(k.value) for k in arg.keywords}
+        return class_(*call_args, **call_kwargs)
+
+    def _eval_dict(self, arg: ast.Dict) -> Dict[Any, Any]:
+        if any(k is None for k in arg.keys):
+            raise ValueError("Unsupported dict unpacking in message arguments")
+        return {
+            self._eval_arg(k): self._eval_arg(v) for k, v in zip(arg.keys, arg.values)
+        }
+
+
+# Names that repr() emits for constants. nan has always been read back as None.
+_NAME_CONSTANTS: Dict[str, Any] = {"None": None, "True": True, "False": False, "nan": None}
+
+# Calls that repr() emits for set types rather than for message classes
+_SET_TYPES: Dict[str, type] = {"set": set, "frozenset": frozenset}
+
+# Node type -> evaluator; exact type lookups instead of an isinstance chain per node
+_EVAL_HANDLERS: Dict[type, Callable[[ReprMessageParser, Any], Any]] = {
+    ast.Constant: lambda self, arg: arg.value,
+    ast.Name: ReprMessageParser._eval_name,
+    ast.UnaryOp: ReprMessageParser._eval_unary,
+    ast.Call: ReprMessageParser._eval_call,
+    ast.List: lambda self, arg: [self._eval_arg(a) for a in arg.elts],
+    ast.Tuple: lambda self, arg: tuple(self._eval_arg(a) for a in arg.elts),
+    ast.Set: lambda self, arg: {self._eval_arg(a) for a in arg.elts},
+    ast.Dict: ReprMessageParser._eval_dict,
+}
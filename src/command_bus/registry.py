@@ -1,68 +1,223 @@
 """Router for mapping command message types to handlers."""
 
+import datetime
+import decimal
+import enum
 import inspect
 import sys
-from typing import Any, Callable, List, Optional, Union, get_type_hints
+import types
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    ForwardRef,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
-from pydantic import BaseModel, ConfigDict, Field, create_model
+from pydantic import create_model
 
 from .interfaces import CommandBusRouterInterface, CommandMessage, CommandHandler
 
 
+@lru_cache(maxsize=1024)
+def _class_qual_name(cls: type) -> str:
+    """
+    Qualified name of a class, memoized since message types repeat on every dispatch.
+
+    Interned, so the router's bucket keys are the one shared copy of each
+    name and lookups with an interned string (e.g. a literal) match on identity.
+    """
+    return sys.intern(f"{cls.__module__}.{cls.__name__}")
+
+
 def get_qual_name(obj: Union[type, object]) -> str:
     """Return the qualified name (module + class name) for a class or instance."""
-    if inspect.isclass(obj):
-        return obj.__module__ + "." + obj.__name__
-    return type(obj).__module__ + "." + type(obj).__name__
+    # isinstance(obj, type) is what inspect.isclass does, without the extra call
+    if isinstance(obj, type):
+        return _class_qual_name(obj)
+    return _class_qual_name(type(obj))
+
+
+# Field types whose model_dump() value is the attribute itself
+_PLAIN_TYPES = (
+    str, int, float, bool, bytes, type(None),
+    datetime.datetime, datetime.date, datetime.time, datetime.timedelta,
+    decimal.Decimal, uuid.UUID,
+)
+
+
+def _is_plain_annotation(annotation: Any) -> bool:
+    """Whether a field of this type reads the same from the instance as from model_dump()."""
+    if get_origin(annotation) is Union or type(annotation).__name__ == "UnionType":
+        return all(_is_plain_annotation(arg) for arg in get_args(annotation))
+    return inspect.isclass(annotation) and (
+        issubclass(annotation, _PLAIN_TYPES) or issubclass(annotation, enum.Enum)
+    )
+
+
+_EMPTY = inspect.Parameter.empty
+_POSITIONAL_KINDS = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _function_params(func: Callable[..., Any]) -> Tuple[Tuple[str, Any, bool], ...]:
+    """
+    Return (name, default or inspect.Parameter.empty, positional) for each of
+    func's parameters except self.
+
+    Plain functions are read straight from __code__ and __defaults__;
+    anything inspect.signature treats specially (wrapped or *args/**kwargs
+    functions, an explicit __signature__, other callables) goes through it.
+    """
+    code = getattr(func, "__code__", None)
+    if (
+        isinstance(func, types.FunctionType)
+        and not hasattr(func, "__wrapped__")
+        and not hasattr(func, "__signature__")
+        and not code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+    ):
+        n_positional = code.co_argcount
+        names = code.co_varnames[: n_positional + code.co_kwonlyargcount]
+        defaults = func.__defaults__ or ()
+        kwdefaults = func.__kwdefaults__ or {}
+        first_default = n_positional - len(defaults)
+        params = []
+        for i, name in enumerate(names):
+            if i < n_positional:
+                default = defaults[i - first_default] if i >= first_default else _EMPTY
+            else:
+                default = kwdefaults.get(name, _EMPTY)
+            if name != "self":
+                params.append((name, default, i < n_positional))
+        return tuple(params)
+    return tuple(
+        (name, p.default, p.kind in _POSITIONAL_KINDS)
+        for name, p in inspect.signature(func).parameters.items()
+        if name != "self"
+    )
+
+
+def _type_hints(func: Callable[..., Any], params: Tuple[Tuple[str, Any, bool], ...]) -> Dict[str, Any]:
+    """
+    Return func's resolved annotations, or {} when they cannot be resolved.
+
+    get_type_hints dominates decoration time, so it only runs when something
+    needs resolving: string or forward-reference annotations, a wrapped
+    function, or (before Python 3.11) a None default it turns into Optional.
+    """
+    annotations = getattr(func, "__annotations__", None)
+    if (
+        isinstance(annotations, dict)
+        and not hasattr(func, "__wrapped__")
+        and not any(isinstance(a, (str, ForwardRef)) for a in annotations.values())
+        and (sys.version_info >= (3, 11) or all(default is not None for _, default, _ in params))
+    ):
+        return annotations
+    try:
+        return get_type_hints(func)
+    except Exception:
+        return {}
+
+
+@lru_cache(maxsize=1024)
+def _build_command_message_class(
+    name: str,
+    module_name: str,
+    fields: Tuple[Tuple[str, Any, Any, type], ...],
+) -> type:
+    """
+    Create the CommandMessage subclass for (name, module, fields), where
+    each field is (name, annotation, default, type(default)).
+
+    Memoized because create_model() runs pydantic's whole schema build; a
+    function decorated again with the same signature (re-imports, tests,
+    factories) gets the class built the first time.
+    """
+    model = create_model(
+        name,
+        __base__=CommandMessage,
+        # Compile the pydantic-core schema on first use, not at decoration
+        # time; handlers that are never published to cost nothing at import
+        __cls_kwargs__={"defer_build": True},
+        # (type, default) tuples; Ellipsis marks a required field
+        **{field_name: (ann, default) for field_name, ann, default, _ in fields},
+    )
+    model.__module__ = module_name
+    return model
 
 
 def _command_message_class_from_signature(
     func: Callable[..., Any],
     model_name: Optional[str] = None,
+    params: Optional[Tuple[Tuple[str, Any, bool], ...]] = None,
 ) -> type:
-    """Build a CommandMessage subclass whose fields match the function's parameters."""
-    sig = inspect.signature(func)
-    try:
-        hints = get_type_hints(func)
-    except Exception:
-        hints = {}
-    fields: dict[str, tuple[type, Any]] = {}
-    for name, param in sig.parameters.items():
-        if name == "self":
-            continue
-        ann = hints.get(name, Any)
-        if param.default is inspect.Parameter.empty:
-            fields[name] = (ann, ...)
-        else:
-            fields[name] = (ann, Field(default=param.default))
+    """
+    Build a CommandMessage subclass whose fields match the function's parameters.
+    Pass params when the caller already has _function_params(func).
+    """
+    if params is None:
+        params = _function_params(func)
+    hints = _type_hints(func, params)
+    # Ellipsis marks a required field; type(default) keeps e.g. a default of
+    # 1 and of True from sharing a class
+    fields = tuple(
+        (name, hints.get(name, Any), d, type(d))
+        for name, d in ((name, ... if default is _EMPTY else default) for name, default, _ in params)
+    )
     name = model_name or f"{func.__name__}Message"
-    model = create_model(name, __base__=CommandMessage, **fields)
     module_name = getattr(func, "__module__", "__main__")
-    model.__module__ = module_name
-    # Register on the module so repr-based parsers can resolve the class by name
-    mod = inspect.getmodule(func)
+    try:
+        hash(fields)
+    except TypeError:
+        # E.g. a list default; build without the cache
+        model = _build_command_message_class.__wrapped__(name, module_name, fields)
+    else:
+        model = _build_command_message_class(name, module_name, fields)
+    # Register on the module so repr-based parsers can resolve the class by name.
+    # func.__module__ names it already; no need for inspect.getmodule's search.
+    # For __main__ this is a fallback; the recommended approach is a shared module.
+    mod = sys.modules.get(module_name) if module_name else None
     if mod is not None:
         setattr(mod, name, model)
-        # Also register in sys.modules if module is __main__ to help with cross-process imports
-        # Note: This is a fallback; the recommended approach is to use a shared module
-        if module_name == "__main__" and "__main__" in sys.modules:
-            main_module = sys.modules["__main__"]
-            if not hasattr(main_module, name):
-                setattr(main_module, name, model)
     return model
 
 
-class CommandBusRouterEntry(BaseModel):
-    """A single router entry binding a message type to a handler class."""
+@dataclass(frozen=True, init=False)
+class CommandBusRouterEntry:
+    """
+    A single router entry binding a message type to a handler class.
+
+    Entries compare equal (and hash) by message_class and handler_class;
+    message_qual_name is derived once at construction.
+
+    With reuse_instance=True a bus creates one handler instance and shares it
+    between messages (including concurrent dispatches); only use it for
+    handlers that keep no per-message state on self. By default every
+    dispatch gets a fresh instance.
+    """
+
+    # message_qual_name and reuse_instance are slots rather than fields: set in __init__, not compared
+    __slots__ = ("handler_class", "message_class", "message_qual_name", "reuse_instance")
 
     handler_class: type
     message_class: type
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
-
-    @property
-    def message_qual_name(self) -> str:
-        return get_qual_name(self.message_class)
+    def __init__(self, handler_class: type, message_class: type, reuse_instance: bool = False) -> None:
+        if not isinstance(handler_class, type) or not isinstance(message_class, type):
+            raise TypeError("handler_class and message_class must be classes")
+        object.__setattr__(self, "handler_class", handler_class)
+        object.__setattr__(self, "message_class", message_class)
+        object.__setattr__(self, "message_qual_name", get_qual_name(message_class))
+        object.__setattr__(self, "reuse_instance", reuse_instance)
 
     def is_message_match(
         self,
@@ -84,29 +239,88 @@ class CommandBusRouter(CommandBusRouterInterface):
         self,
         command_handlers: Optional[List[CommandBusRouterEntry]] = None,
     ) -> None:
-        self.handlers: List[CommandBusRouterEntry] = command_handlers or []
+        # Entries bucketed by message qualified name. Each bucket is an
+        # insertion-ordered dict used as an ordered set, so duplicate checks and
+        # deregister() are O(1) while handlers keep their registration order.
+        self._entries: Dict[str, Dict[CommandBusRouterEntry, None]] = {}
+        # Every entry in global registration order, also as an ordered set
+        self._order: Dict[CommandBusRouterEntry, None] = {}
+        # Bumped by register()/deregister() so callers can cache lookups per message type
+        self.version = 0
+        self.handlers = command_handlers or []
+
+    @property
+    def handlers(self) -> Tuple[CommandBusRouterEntry, ...]:
+        """
+        All router entries in registration order, as a read-only tuple.
+
+        This used to be a plain list that callers could append to; use
+        register()/deregister(), or assign a new sequence, to change it.
+        """
+        return tuple(self._order)
+
+    @handlers.setter
+    def handlers(self, entries: Iterable[CommandBusRouterEntry]) -> None:
+        self._entries = {}
+        self._order = {}
+        for entry in entries:
+            self._entries.setdefault(entry.message_qual_name, {})[entry] = None
+            self._order[entry] = None
+        self.version += 1
 
     def get_handlers_for_message(
         self,
         message_class: Union[CommandMessage, type],
     ) -> List[CommandBusRouterEntry]:
         """Return all router entries that handle this message type."""
-        return [
-            entry for entry in self.handlers if entry.is_message_match(message_class)
-        ]
+        qual_name = message_class if isinstance(message_class, str) else get_qual_name(message_class)
+        return list(self._entries.get(qual_name, ()))
+
+    def handles(self, qual_name: str) -> bool:
+        """
+        Whether a message named qual_name may have handlers.
+
+        False only when that is certain: qual_name is not a registered name and
+        its module is already imported with a class there that is not
+        registered under its own name either. A name that may still be an alias
+        or re-export of a registered class (e.g. "pkg.OrderCreated" for a class
+        defined in pkg.events) counts as handled, so the message gets parsed.
+        """
+        if qual_name in self._entries:
+            return True
+        module_name, _, class_name = qual_name.rpartition(".")
+        module = sys.modules.get(module_name)
+        if module is None:
+            return True
+        message_class = getattr(module, class_name, None)
+        if message_class is None:
+            return False
+        if not isinstance(message_class, type):
+            # Something callable under that name; only parsing tells what it returns
+            return True
+        return _class_qual_name(message_class) in self._entries
 
     def register(
         self,
         message_class: type,
         handler_class: type,
+        reuse_instance: bool = False,
     ) -> None:
-        """Register a handler for a message class."""
+        """
+        Register a handler for a message class. Pass reuse_instance=True for
+        stateless handlers to have a bus share one instance between messages.
+        Registering the same pair again is ignored.
+        """
         entry = CommandBusRouterEntry(
             message_class=message_class,
             handler_class=handler_class,
+            reuse_instance=reuse_instance,
         )
-        if entry not in self.handlers:
-            self.handlers.append(entry)
+        bucket = self._entries.setdefault(entry.message_qual_name, {})
+        if entry not in bucket:
+            bucket[entry] = None
+            self._order[entry] = None
+            self.version += 1
 
     def deregister(
         self,
@@ -118,10 +332,31 @@ class CommandBusRouter(CommandBusRouterInterface):
             message_class=message_class,
             handler_class=handler_class,
         )
-        for i, v in enumerate(self.handlers):
-            if v == entry:
-                self.handlers.pop(i)
-                return
+        bucket = self._entries.get(entry.message_qual_name)
+        if bucket is None or entry not in bucket:
+            return
+        del bucket[entry]
+        del self._order[entry]
+        if not bucket:
+            del self._entries[entry.message_qual_name]
+        self.version += 1
+
+    def warm_up(self) -> int:
+        """
+        Build the Pydantic validator and serializer of every registered message
+        class that has not been built yet, and return how many were built.
+
+        Message classes made by command() defer this to their first use; call
+        warm_up() once at startup so the first messages are not slowed by it.
+        """
+        built = 0
+        for entries in self._entries.values():
+            # Every entry in a bucket shares one message class
+            message_class = next(iter(entries)).message_class
+            if not getattr(message_class, "__pydantic_complete__", True):
+                message_class.model_rebuild()
+                built += 1
+        return built
 
     def command(self):
         """
@@ -132,28 +367,46 @@ class CommandBusRouter(CommandBusRouterInterface):
         """
 
         def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-            message_class = _command_message_class_from_signature(func)
-            sig = inspect.signature(func)
-            param_names = [name for name, p in sig.parameters.items() if name != "self"]
+            params = _function_params(func)
+            message_class = _command_message_class_from_signature(func, params=params)
+            # Shared by process() and message_factory()
+            param_names = tuple(name for name, _, _ in params)
+            fields = message_class.model_fields
+
+            # Nested models, containers, Any, ...: these reach the function as model_dump() values
+            dumped = frozenset(n for n in param_names if not _is_plain_annotation(fields[n].annotation))
 
-            def process(self: Any, message: CommandMessage) -> Any:
-                dump = message.model_dump()
-                kwargs = {k: dump[k] for k in param_names if k in dump}
-                return func(**kwargs)
+            if dumped:
+                # Only the non-plain fields are serialized; plain ones are read from the instance
+                def process(self: Any, message: CommandMessage) -> Any:
+                    values = message.__dict__
+                    dump = message.model_dump(include=dumped)
+                    return func(**{n: dump[n] if n in dumped else values[n] for n in param_names})
+
+            elif all(positional for _, _, positional in params):
+                # Plain fields are passed straight from the instance, positionally
+                def process(self: Any, message: CommandMessage) -> Any:
+                    values = message.__dict__
+                    return func(*[values[n] for n in param_names])
+
+            else:
+                def process(self: Any, message: CommandMessage) -> Any:
+                    values = message.__dict__
+                    return func(**{n: values[n] for n in param_names})
 
             handler_class = type(
                 f"{func.__name__}_Handler",
                 (CommandHandler,),
                 {"process": process},
             )
-            self.register(message_class, handler_class)
-
-            param_names = [name for name, p in sig.parameters.items() if name != "self"]
+            # The generated handler only calls func, so one instance can serve every message
+            self.register(message_class, handler_class, reuse_instance=True)
 
             def message_factory(*args: Any, **kwargs: Any) -> CommandMessage:
-                # Map positional args to param names so message_class(**kwargs) works (Pydantic expects kwargs)
-                kwargs_from_args = dict(zip(param_names, args))
-                return message_class(**{**kwargs_from_args, **kwargs})
+                if args:
+                    # Map positional args to param names so message_class(**kwargs) works (Pydantic expects kwargs)
+                    kwargs = {**dict(zip(param_names, args)), **kwargs}
+                return message_class(**kwargs)
 
             message_factory.__name__ = func.__name__
             message_factory._command_message_class = message_class  # type: ignore[attr-defined]
@@ -2,7 +2,7 @@
 
 import importlib
 import sys
-from typing import Type, TypeVar
+from typing import Dict, Type, TypeVar
 
 T = TypeVar("T")
 
@@ -25,10 +25,18 @@ class ModuleImporter:
                     "See docs/client-and-worker.md for examples."
                 ) from e
             raise
+        # Looked up directly rather than cached per name: command() rebinds
+        # generated message classes on their module, and that must be seen
+        self._namespace = vars(self._module)
 
     def get_class(self, class_name: str) -> Type[T]:
         """Return the class named class_name from the module."""
         try:
+            return self._namespace[class_name]
+        except KeyError:
+            pass
+        try:
+            # Names served by a module-level __getattr__ are not in the namespace
             return getattr(self._module, class_name)
         except AttributeError:
             # If module is __main__ and class not found, provide helpful error
@@ -43,3 +51,17 @@ class ModuleImporter:
                 f"Class '{class_name}' not found in module '{self._module_path}'. "
                 f"Available attributes: {[x for x in dir(self._module) if not x.startswith('_')]}"
             )
+
+
+_importers: Dict[str, ModuleImporter] = {}
+
+
+def get_module_importer(module_path: str) -> ModuleImporter:
+    """
+    Return a ModuleImporter for module_path, reusing the previous one while the
+    module it imported is still the one in sys.modules (so reloads are picked up).
+    """
+    importer = _importers.get(module_path)
+    if importer is None or sys.modules.get(module_path) is not importer._module:
+        importer = _importers[module_path] = ModuleImporter(module_path)
+    return importer
@@ -80,3 +80,9 @@ def test_base64_parser_decompress_non_gzip_raises():
     parser = Base64MessageParser(encoded, decompress=True)
     with pytest.raises(Exception):  # gzip.BadGzipFile or OSError
         parser.initialize()
+
+
+def test_base64_parser_serialize_round_trip():
+    msg = Command(name="echo", value=7)
+    raw = Base64MessageParser.serialize(msg)
+    assert Base64MessageParser(raw).initialize() == msg
@@ -1,6 +1,7 @@
 """Tests for file-based response store."""
 
 import json
+import math
 import time
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -126,6 +127,34 @@ def test_file_response_store_json_serialization():
         assert result == complex_data
 
 
+def test_file_response_store_round_trips_ints_wider_than_64_bits():
+    """Ints orjson cannot encode fall back to the stdlib encoder."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        store = FileResponseStore(storage_file=store_file)
+
+        store.set("big", {"value": 2**70, "negative": -(2**65)}, ttl_seconds=60)
+        assert store.get("big") == {"value": 2**70, "negative": -(2**65)}
+        assert FileResponseStore(storage_file=store_file).get("big") == {"value": 2**70, "negative": -(2**65)}
+
+
+def test_file_response_store_keeps_nan_and_infinity():
+    """NaN and infinity are written like stdlib json does instead of as null."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        store = FileResponseStore(storage_file=store_file)
+
+        store.set("floats", {"inf": float("inf"), "ninf": float("-inf"), "nan": [float("nan")], "none": None}, ttl_seconds=60)
+        raw = store_file.read_bytes()
+        assert b"Infinity" in raw and b"NaN" in raw
+
+        result = FileResponseStore(storage_file=store_file).get("floats")
+        assert result["inf"] == float("inf")
+        assert result["ninf"] == float("-inf")
+        assert math.isnan(result["nan"][0])
+        assert result["none"] is None
+
+
 def test_file_response_store_default_storage_location():
     """Test that default storage location is created."""
     store = FileResponseStore()
@@ -162,15 +191,166 @@ def test_file_response_store_expired_cleanup():
         # Wait for key1 to expire
         time.sleep(0.2)
 
-        # Access key1 (should trigger cleanup)
+        # Expired entries read as missing without the read touching the log
+        size_before = store_file.stat().st_size
         assert store.get("key1") is None
+        assert store_file.stat().st_size == size_before
 
         # key2 should still exist
         assert store.get("key2") == "value2"
 
-        # Verify key1 was removed from file
-        with open(store_file, 'r') as f:
-            data = json.load(f)
-            assert "key1" not in data
-            assert "key2" in data
+        # vacuum() is what drops expired entries from the log
+        assert store.vacuum() == 1
+        assert store.vacuum() == 0
+
+        # Verify key1 was removed from the log on disk
+        data = {}
+        for line in store_file.read_text().splitlines():
+            entry = json.loads(line)
+            if "deleted" in entry:
+                data.pop(entry["deleted"], None)
+            else:
+                data[entry["key"]] = entry
+        assert "key1" not in data
+        assert "key2" in data
+
+
+
+def test_file_response_store_appends_log_lines():
+    """set and delete append to the log instead of rewriting it."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        store = FileResponseStore(storage_file=store_file)
+
+        store.set("key1", "value1", ttl_seconds=60)
+        store.set("key2", "value2", ttl_seconds=60)
+        store.set("key3", "value3", ttl_seconds=60)
+        store.delete("key1")
+
+        lines = [json.loads(line) for line in store_file.read_text().splitlines()]
+        assert [line.get("key", line.get("deleted")) for line in lines] == ["key1", "key2", "key3", "key1"]
+        assert FileResponseStore(storage_file=store_file).get("key2") == "value2"
+
+
+def test_file_response_store_compacts_overwrites():
+    """Repeated sets of one key do not grow the log without bound."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        store = FileResponseStore(storage_file=store_file)
+
+        for i in range(20):
+            store.set("key1", i, ttl_seconds=60)
+
+        assert len(store_file.read_text().splitlines()) <= 2
+        assert FileResponseStore(storage_file=store_file).get("key1") == 19
+
+
+def test_file_response_store_reads_legacy_json_object():
+    """A store file written as a single JSON object is still readable."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        store_file.write_text(json.dumps({
+            "old": {"value": json.dumps({"data": "legacy"}), "expiry": time.time() + 60},
+        }, indent=2))
+        store = FileResponseStore(storage_file=store_file)
+
+        assert store.get("old") == {"data": "legacy"}
+        store.set("new", "value", ttl_seconds=60)
+        assert FileResponseStore(storage_file=store_file).get("old") == {"data": "legacy"}
+
+
+def test_file_response_store_get_skips_lock():
+    """Reading a fresh entry or a missing key does not take the file lock."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        FileResponseStore(storage_file=store_file).set("key1", {"data": "value"}, ttl_seconds=60)
+        store = FileResponseStore(storage_file=store_file)
+
+        def fail():
+            raise AssertionError("lock taken for a read")
+
+        store._acquire_lock = fail
+        assert store.get("key1") == {"data": "value"}
+        assert store.get("missing") is None
+
+
+def test_file_response_store_stores_values_natively():
+    """Values are written into the log line as JSON, not as an encoded string."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        store = FileResponseStore(storage_file=store_file)
+
+        store.set("key1", {"nested": [1, 2]}, ttl_seconds=60)
+        store.set("key2", "42", ttl_seconds=60)
+
+        first, second = (json.loads(line) for line in store_file.read_text().splitlines())
+        assert first["data"] == {"nested": [1, 2]}
+        # Strings come back as strings, even when they look like JSON
+        assert FileResponseStore(storage_file=store_file).get("key2") == "42"
+
+
+def test_file_response_store_replays_large_log():
+    """A log past the mmap threshold replays fully, and later appends are still picked up."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        writer = FileResponseStore(storage_file=store_file)
+        for i in range(200):
+            writer.set(f"key{i}", {"payload": "x" * 500}, ttl_seconds=60)
+        assert store_file.stat().st_size > 64 * 1024
+
+        reader = FileResponseStore(storage_file=store_file)
+        assert reader.get("key0") == {"payload": "x" * 500}
+        assert reader.get("key199") == {"payload": "x" * 500}
+
+        writer.set("late", "value", ttl_seconds=60)
+        assert reader.get("late") == "value"
+
+
+def test_file_response_store_stores_pydantic_models_as_dicts():
+    """Pydantic model results are written as their JSON dump, like RedisResponseStore."""
+    from pydantic import BaseModel
+
+    class Price(BaseModel):
+        cents: int
+        currency: str = "USD"
+
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        FileResponseStore(storage_file=store_file).set("k", Price(cents=5), ttl_seconds=60)
+        assert FileResponseStore(storage_file=store_file).get("k") == {"cents": 5, "currency": "USD"}
+
+
+def test_file_response_store_writer_reads_back_decoded_value():
+    """The writing instance returns the stored JSON form, like any other reader of the log."""
+    from pydantic import BaseModel
+
+    class Price(BaseModel):
+        cents: int
+
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "responses.json"
+        store = FileResponseStore(storage_file=store_file)
+
+        value = {"price": Price(cents=5), "tags": ("a", "b"), 1: "one"}
+        store.set("k", value, ttl_seconds=60)
+        value["tags"] = "changed"
+
+        expected = {"price": {"cents": 5}, "tags": ["a", "b"], "1": "one"}
+        assert store.get("k") == expected
+        assert FileResponseStore(storage_file=store_file).get("k") == expected
+
+
+def test_file_response_store_missing_file_skips_lock():
+    """get() and delete() before anything is stored neither lock nor create files."""
+    with TemporaryDirectory() as tmpdir:
+        store_file = Path(tmpdir) / "nested" / "responses.json"
+        store = FileResponseStore(storage_file=store_file)
+        assert store_file.parent.is_dir()
+
+        def fail():
+            raise AssertionError("lock taken with no store file")
 
+        store._acquire_lock = fail
+        assert store.get("missing") is None
+        store.delete("missing")
+        assert list(store_file.parent.iterdir()) == []
@@ -1,7 +1,11 @@
 """Tests for async handler dispatch."""
 
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
-from command_bus import CommandBusRouter, CommandMessage, CommandHandler, MessageParser
+from command_bus import CommandBus, CommandBusRouter, CommandMessage, CommandHandler, MessageParser
+from command_bus.adapters import InMemoryResponseStore
 
 
 class AsyncMessage(CommandMessage):
@@ -24,3 +28,228 @@ async def test_dispatch_calls_async_handler():
     handler = entries[0].handler_instance()
     result = await handler(msg)
     assert result == "ok:test"
+
+
+class PingMessage(CommandMessage):
+    name: str
+
+
+_pinged = None
+
+
+class WaitForPingHandler(CommandHandler):
+    async def process(self, message: CommandMessage):
+        # Only completes if PingHandler runs while this handler is suspended
+        await asyncio.wait_for(_pinged.wait(), timeout=1)
+        return "waited"
+
+
+class PingHandler(CommandHandler):
+    async def process(self, message: CommandMessage):
+        _pinged.set()
+        return None
+
+
+class FailingHandler(CommandHandler):
+    async def process(self, message: CommandMessage):
+        raise RuntimeError("boom")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_handlers_concurrently_with_parallel_handlers():
+    global _pinged
+    _pinged = asyncio.Event()
+    registry = CommandBusRouter()
+    registry.register(PingMessage, WaitForPingHandler)
+    registry.register(PingMessage, PingHandler)
+    store = InMemoryResponseStore()
+    bus = CommandBus(
+        queue_adapter=MagicMock(),
+        command_router=registry,
+        response_store=store,
+        parallel_handlers=True,
+    )
+    await bus.dispatch("tests.test_handler_async.PingMessage(name='a', correlation_id='c1')")
+    assert store.get("c1") == "waited"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_parallel_handlers_reraises_handler_error():
+    global _pinged
+    _pinged = asyncio.Event()
+    registry = CommandBusRouter()
+    registry.register(PingMessage, PingHandler)
+    registry.register(PingMessage, FailingHandler)
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry, parallel_handlers=True)
+    with pytest.raises(RuntimeError, match="boom"):
+        await bus.dispatch("tests.test_handler_async.PingMessage(name='a')")
+    assert _pinged.is_set()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_caches_handler_lookup_until_router_changes():
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, AsyncHandler)
+    store = InMemoryResponseStore()
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry, response_store=store)
+    lookups = []
+    original = registry.get_handlers_for_message
+
+    def counting(message_class):
+        lookups.append(message_class)
+        return original(message_class)
+
+    registry.get_handlers_for_message = counting
+    raw = "tests.test_handler_async.AsyncMessage(name='a', correlation_id='{}')"
+    await bus.dispatch(raw.format("c1"))
+    await bus.dispatch(raw.format("c2"))
+    assert lookups == [AsyncMessage]
+
+    class OverrideHandler(CommandHandler):
+        async def process(self, message: CommandMessage):
+            return "override"
+
+    registry.register(AsyncMessage, OverrideHandler)
+    await bus.dispatch(raw.format("c3"))
+    assert len(lookups) == 2
+    assert store.get("c3") == "override"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_reuses_pooled_parser():
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, AsyncHandler)
+    store = InMemoryResponseStore()
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry, response_store=store)
+    await bus.dispatch("tests.test_handler_async.AsyncMessage(name='a', correlation_id='c1')")
+    (parser,) = bus._parser_pool
+    await bus.dispatch("tests.test_handler_async.AsyncMessage(name='b', correlation_id='c2')")
+    assert list(bus._parser_pool) == [parser]
+    assert store.get("c1") == "ok:a"
+    assert store.get("c2") == "ok:b"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_creates_a_handler_instance_per_message():
+    created = []
+
+    class CountingHandler(CommandHandler):
+        def __init__(self):
+            created.append(self)
+
+        async def process(self, message: CommandMessage):
+            return message.name
+
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, CountingHandler)
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry)
+    await bus.dispatch("tests.test_handler_async.AsyncMessage(name='a')")
+    await bus.dispatch("tests.test_handler_async.AsyncMessage(name='b')")
+    assert len(created) == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatch_skips_unhandled_message_types_without_parsing():
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, AsyncHandler)
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry)
+    # The module has no such class, so parsing this message would raise
+    await bus.dispatch("tests.test_handler_async.NoSuchMessage(name='a')")
+    # Imported, but not a registered class
+    await bus.dispatch("tests.test_handler_async.PingMessage(name='a')")
+    assert not bus._parser_pool
+
+
+# Another name for a registered class, as a re-export would give it
+AliasedAsyncMessage = AsyncMessage
+
+
+@pytest.mark.asyncio
+async def test_dispatch_parses_messages_named_by_an_alias_of_a_registered_class():
+    handled = []
+
+    class RecordingHandler(CommandHandler):
+        async def process(self, message: CommandMessage):
+            handled.append(message.name)
+
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, RecordingHandler)
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry)
+    await bus.dispatch("tests.test_handler_async.AliasedAsyncMessage(name='alias')")
+    assert handled == ["alias"]
+    assert registry.handles("tests.test_handler_async.AliasedAsyncMessage")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_parses_messages_from_modules_not_yet_imported():
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, AsyncHandler)
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry)
+    # The module might re-export a registered class, so the message is parsed
+    assert registry.handles("no_such_module.OtherMessage")
+    with pytest.raises(ImportError):
+        await bus.dispatch("no_such_module.OtherMessage(name='a')")
+
+
+@pytest.mark.asyncio
+async def test_work_caps_in_flight_dispatches_at_max_concurrency():
+    in_flight = []
+    peak = []
+
+    class SlowHandler(CommandHandler):
+        async def process(self, message: CommandMessage):
+            in_flight.append(message.name)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0)
+            in_flight.remove(message.name)
+
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, SlowHandler)
+    messages = [MagicMock(body=str(AsyncMessage(name=str(i)))) for i in range(5)]
+    adapter = MagicMock()
+    adapter.get_messages.return_value = messages
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, max_concurrency=2)
+    await bus.work()
+    assert len(peak) == 5
+    assert max(peak) == 2
+    adapter.dequeue_batch.assert_called_once_with(messages)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_gives_stateful_handlers_distinct_instances_by_default():
+    seen = []
+
+    class StatefulHandler(CommandHandler):
+        async def process(self, message: CommandMessage):
+            self.name = message.name
+            await asyncio.sleep(0)
+            seen.append((self, self.name))
+
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, StatefulHandler)
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry)
+    await asyncio.gather(
+        bus.dispatch("tests.test_handler_async.AsyncMessage(name='a')"),
+        bus.dispatch("tests.test_handler_async.AsyncMessage(name='b')"),
+    )
+    assert sorted(name for _, name in seen) == ["a", "b"]
+    assert seen[0][0] is not seen[1][0]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_shares_handler_instance_when_registered_with_reuse_instance():
+    created = []
+
+    class StatelessHandler(CommandHandler):
+        def __init__(self):
+            created.append(self)
+
+        async def process(self, message: CommandMessage):
+            return message.name
+
+    registry = CommandBusRouter()
+    registry.register(AsyncMessage, StatelessHandler, reuse_instance=True)
+    bus = CommandBus(queue_adapter=MagicMock(), command_router=registry)
+    await bus.dispatch("tests.test_handler_async.AsyncMessage(name='a')")
+    await bus.dispatch("tests.test_handler_async.AsyncMessage(name='b')")
+    assert len(created) == 1
@@ -31,3 +31,64 @@ def test_command_handler_abstract():
     """CommandHandler cannot be instantiated without process()."""
     with pytest.raises(TypeError):
         CommandHandler()
+
+
+def test_command_bus_adapter_enqueue_many_defaults_to_enqueue():
+    """The default enqueue_many enqueues each message in order."""
+    from command_bus import CommandBusAdapter
+
+    class E(CommandMessage):
+        id: str
+
+    class RecordingAdapter(CommandBusAdapter):
+        def __init__(self):
+            self.calls = []
+
+        def enqueue(self, message_instance, delay_seconds=0):
+            self.calls.append((message_instance.id, delay_seconds))
+
+        def dequeue(self, message_instance):
+            pass
+
+        def get_messages(self, *args, **kwargs):
+            return []
+
+    adapter = RecordingAdapter()
+    adapter.enqueue_many([E(id="a"), E(id="b")], delay_seconds=3)
+    assert adapter.calls == [("a", 3), ("b", 3)]
+
+
+def test_response_store_batch_methods_default_to_single_calls():
+    """The default set_many/get_many go through set() and get()."""
+    from command_bus.adapters import InMemoryResponseStore
+
+    store = InMemoryResponseStore()
+    store.set_many([("a", 1, 60), ("b", {"x": 2}, 60)])
+    assert store.get_many(["a", "missing", "b"]) == [1, None, {"x": 2}]
+
+
+@pytest.mark.parametrize(
+    "package_name",
+    ["command_bus", "command_bus.adapters", "command_bus.adapters.queue", "command_bus.adapters.response"],
+)
+def test_every_exported_name_resolves(package_name):
+    """Each name in __all__ (including lazily imported adapters) can be imported."""
+    import importlib
+
+    package = importlib.import_module(package_name)
+    for name in package.__all__:
+        assert getattr(package, name) is not None, name
+
+
+def test_lazy_adapters_are_exported_when_their_dependency_is_installed():
+    from importlib.util import find_spec
+
+    from command_bus import adapters
+    from command_bus.adapters import queue, response
+
+    for package in (queue, response):
+        for name, (_, requires) in package._LAZY.items():
+            installed = requires is None or find_spec(requires) is not None
+            assert (name in package.__all__) == installed, name
+            assert (name in adapters.__all__) == installed, name
+        assert set(package.__all__) <= set(adapters.__all__)
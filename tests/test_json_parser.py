@@ -11,11 +11,24 @@ class OrderCreated(CommandMessage):
     amount_cents: int
 
 
+class Reading(CommandMessage):
+    level: float
+
+
 class NestedMessage(CommandMessage):
     name: str
     count: int
 
 
+class DefaultedByInit(CommandMessage):
+    name: str
+    label: str = ""
+
+    def __init__(self, **data):
+        data.setdefault("label", data.get("name", "").upper())
+        super().__init__(**data)
+
+
 def test_json_parser_initialize():
     payload = {
         "__type__": "tests.test_json_parser.OrderCreated",
@@ -81,3 +94,52 @@ def test_json_parser_not_command_message_class_raises():
     parser = JsonMessageParser(json.dumps({"__type__": "builtins.dict", "x": 1}))
     with pytest.raises(ValueError, match="is not a CommandMessage subclass"):
         parser.initialize()
+
+
+def test_json_parser_serialize_round_trip():
+    msg = OrderCreated(order_id="ord-789", amount_cents=250, correlation_id="c-1")
+    raw = JsonMessageParser.serialize(msg)
+    assert json.loads(raw)["__type__"] == "tests.test_json_parser.OrderCreated"
+    assert JsonMessageParser(raw).initialize() == msg
+
+
+def test_json_parser_reset_keeps_type_key():
+    parser = JsonMessageParser(
+        json.dumps({"kind": "tests.test_json_parser.OrderCreated", "order_id": "a", "amount_cents": 1}),
+        type_key="kind",
+    )
+    assert parser.initialize().order_id == "a"
+    parser.reset(json.dumps({"kind": "tests.test_json_parser.OrderCreated", "order_id": "b", "amount_cents": 2}))
+    assert parser.initialize() == OrderCreated(order_id="b", amount_cents=2)
+
+
+def test_json_parser_accepts_integers_beyond_64_bits():
+    big = 2**70
+    parser = JsonMessageParser(
+        json.dumps({"__type__": "tests.test_json_parser.OrderCreated", "order_id": "x", "amount_cents": big})
+    )
+    assert parser.initialize().amount_cents == big
+
+
+def test_json_parser_accepts_stdlib_nan_literals():
+    payload = {"__type__": "tests.test_json_parser.Reading", "level": float("nan")}
+    message = JsonMessageParser(json.dumps(payload)).initialize()
+    assert message.level != message.level
+
+
+def test_json_parser_initialize_is_repeatable_and_reset_keeps_type_key():
+    parser = JsonMessageParser(
+        json.dumps({"type": "tests.test_json_parser.OrderCreated", "order_id": "a", "amount_cents": 1}),
+        type_key="type",
+    )
+    assert parser.initialize() == parser.initialize() == OrderCreated(order_id="a", amount_cents=1)
+    parser.reset(json.dumps({"type": "tests.test_json_parser.OrderCreated", "order_id": "b", "amount_cents": 2}))
+    assert parser.initialize() == OrderCreated(order_id="b", amount_cents=2)
+
+
+def test_json_parser_runs_custom_init():
+    """Classes overriding __init__ are built as message_class(**payload)."""
+    raw = json.dumps({"__type__": "tests.test_json_parser.DefaultedByInit", "name": "abc"})
+    msg = JsonMessageParser(raw).initialize()
+    assert msg == DefaultedByInit(name="abc")
+    assert msg.label == "ABC"
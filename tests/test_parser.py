@@ -9,6 +9,15 @@ class SimpleMessage(CommandMessage):
     y: str
 
 
+class ListMessage(CommandMessage):
+    items: list
+
+
+class SetMessage(CommandMessage):
+    tags: set = set()
+    frozen: frozenset = frozenset()
+
+
 def test_get_message_components():
     module_path, class_name, param_string = ReprMessageParser.get_message_components(
         "tests.test_parser.SimpleMessage(1, 'hello')"
@@ -18,6 +27,11 @@ def test_get_message_components():
     assert param_string == "1, 'hello'"
 
 
+def test_peek_qual_name():
+    assert ReprMessageParser.peek_qual_name("tests.test_parser.SimpleMessage(1, 'hello')") == "tests.test_parser.SimpleMessage"
+    assert ReprMessageParser.peek_qual_name("not a message") is None
+
+
 def test_parser_initialize_with_kwargs():
     parser = MessageParser("tests.test_parser.SimpleMessage(x=1, y='hello')")
     msg = parser.initialize()
@@ -73,3 +87,105 @@ def test_custom_parser_implements_base():
     msg = parser.initialize()
     assert msg.y == "hello"
     assert isinstance(msg, SimpleMessage)
+
+
+def test_module_importer_reused_until_module_replaced(monkeypatch):
+    import sys
+    import types
+
+    from command_bus.utils import get_module_importer
+
+    first = get_module_importer("tests.test_parser")
+    assert get_module_importer("tests.test_parser") is first
+
+    monkeypatch.setitem(sys.modules, "tests.test_parser", types.ModuleType("tests.test_parser"))
+    assert get_module_importer("tests.test_parser") is not first
+
+
+def test_module_importer_get_class_sees_rebinding_and_module_getattr(monkeypatch):
+    import sys
+    import types
+
+    from command_bus.utils import ModuleImporter
+
+    module = types.ModuleType("tests._importer_target")
+    module.Target = int
+
+    def module_getattr(name):
+        if name == "Lazy":
+            return str
+        raise AttributeError(name)
+
+    module.__getattr__ = module_getattr
+    monkeypatch.setitem(sys.modules, "tests._importer_target", module)
+    importer = ModuleImporter("tests._importer_target")
+    assert importer.get_class("Target") is int
+    module.Target = float
+    assert importer.get_class("Target") is float
+    assert importer.get_class("Lazy") is str
+    with pytest.raises(AttributeError, match="not found"):
+        importer.get_class("Missing")
+
+
+def test_repr_parser_reset_reuses_instance():
+    parser = ReprMessageParser("tests.test_parser.SimpleMessage(x=1, y='a')")
+    assert parser.initialize() == SimpleMessage(x=1, y="a")
+    parser.reset("tests.test_parser.SimpleMessage(x=2, y='b')")
+    assert parser.initialize() == SimpleMessage(x=2, y="b")
+
+
+def test_repr_parser_parse_args_literals():
+    parser = ReprMessageParser("tests.test_parser.SimpleMessage(x=1, y='a')")
+    args, kwargs = parser.parse_args("-1, (1, 2), {3}, {'a': [1, -2.5]}, None, True, k=nan")
+    assert args == [-1, (1, 2), {3}, {"a": [1, -2.5]}, None, True]
+    assert kwargs == {"k": None}
+    with pytest.raises(ValueError, match="Unsupported name"):
+        parser.parse_args("undefined_name")
+    with pytest.raises(ValueError, match="Unsupported"):
+        parser.parse_args("1 + x")
+
+
+def test_repr_parser_caches_constant_arguments():
+    """Literal-only bodies are evaluated once; mutable values are built fresh each time."""
+    from command_bus.parsers.repr_parser import _constant_args
+
+    raw = "tests.test_parser.SimpleMessage(x=7, y='cached')"
+    assert ReprMessageParser(raw).initialize() == SimpleMessage(x=7, y="cached")
+    hits = _constant_args.cache_info().hits
+    assert ReprMessageParser(raw).initialize() == SimpleMessage(x=7, y="cached")
+    assert _constant_args.cache_info().hits == hits + 1
+
+    raw_list = "tests.test_parser.ListMessage(items=[1, 2])"
+    first = ReprMessageParser(raw_list).initialize()
+    first.items.append(3)
+    assert ReprMessageParser(raw_list).initialize().items == [1, 2]
+    assert ReprMessageParser(raw, cache_parsed=False).initialize() == SimpleMessage(x=7, y="cached")
+
+
+def test_repr_parser_reads_simple_keyword_arguments_without_ast():
+    from command_bus.parsers.repr_parser import _simple_kwargs
+
+    assert _simple_kwargs("x=7, y='a, b=1', z=-1.5e-05, w=None,") == (
+        ("x", 7), ("y", "a, b=1"), ("z", -1.5e-05), ("w", None)
+    )
+    # Anything else is left to ast, which parses or rejects it as before
+    assert _simple_kwargs("7, y='a'") is None
+    assert _simple_kwargs("y='it\\'s'") is None
+    assert _simple_kwargs("x=1, x=2") is None
+    assert _simple_kwargs("x=007") is None
+    raw = "tests.test_parser.SimpleMessage(x=8, y=\"simple\")"
+    assert ReprMessageParser(raw, cache_parsed=False).initialize() == SimpleMessage(x=8, y="simple")
+
+
+def test_get_message_components_edge_cases():
+    split = ReprMessageParser.get_message_components
+    assert split("tests.test_parser.SimpleMessage()") == ("tests.test_parser", "SimpleMessage", "")
+    assert split("pkg.Msg(note='(a)')\n") == ("pkg", "Msg", "note='(a)'\n")
+    with pytest.raises(ValueError, match="repr-style"):
+        split("no_parens_here")
+
+
+def test_repr_parser_round_trips_set_fields():
+    """Empty sets repr as set() and frozensets as frozenset({...}); neither is a message class."""
+    for msg in (SetMessage(), SetMessage(tags={"a"}, frozen=frozenset({1, 2}))):
+        assert ReprMessageParser(str(msg)).initialize() == msg
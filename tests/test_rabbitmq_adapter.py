@@ -30,6 +30,7 @@ def test_rabbitmq_message_wrapper_delete_acks():
 def test_rabbitmq_adapter_enqueue(pika_mock):
     conn = MagicMock()
     ch = MagicMock()
+    ch.is_closed = False
     pika_mock.BlockingConnection.return_value = conn
     conn.channel.return_value = ch
 
@@ -38,15 +39,71 @@ def test_rabbitmq_adapter_enqueue(pika_mock):
     )
     msg = DummyMessage(id="x")
     adapter.enqueue(msg, delay_seconds=0)
+    adapter.enqueue(msg, delay_seconds=0)
 
+    # One connection and queue declaration serve every publish
+    pika_mock.BlockingConnection.assert_called_once()
     ch.queue_declare.assert_called_once()
-    ch.basic_publish.assert_called_once()
+    assert ch.basic_publish.call_count == 2
     call_kw = ch.basic_publish.call_args[1]
     assert call_kw["routing_key"] == "test-q"
     assert "x" in call_kw["body"] or "id" in call_kw["body"]
+    conn.close.assert_not_called()
+
+    adapter.close()
     conn.close.assert_called_once()
 
 
+@patch("command_bus.adapters.queue.rabbitmq.pika")
+def test_rabbitmq_adapter_enqueue_reconnects_once_after_connection_loss(pika_mock):
+    from pika.exceptions import StreamLostError
+
+    stale, fresh = MagicMock(), MagicMock()
+    stale.is_closed = fresh.is_closed = False
+    stale.basic_publish.side_effect = StreamLostError("connection reset")
+    pika_mock.BlockingConnection.return_value.channel.side_effect = [stale, fresh]
+
+    adapter = RabbitMqCommandBusAdapter(queue_name="q", connection_url="amqp://localhost/")
+    adapter.enqueue(DummyMessage(id="r"))
+
+    assert pika_mock.BlockingConnection.call_count == 2
+    fresh.basic_publish.assert_called_once()
+
+
+@patch("command_bus.adapters.queue.rabbitmq.pika")
+def test_rabbitmq_adapter_serializes_publishes_across_threads(pika_mock):
+    import threading
+    import time
+
+    ch = MagicMock()
+    ch.is_closed = False
+    pika_mock.BlockingConnection.return_value.channel.return_value = ch
+    in_publish = []
+    overlaps = []
+
+    def publish(**kwargs):
+        if in_publish:
+            overlaps.append(kwargs["body"])
+        in_publish.append(True)
+        time.sleep(0.001)
+        in_publish.pop()
+
+    ch.basic_publish.side_effect = publish
+    adapter = RabbitMqCommandBusAdapter(queue_name="q", connection_url="amqp://localhost/")
+
+    threads = [
+        threading.Thread(target=adapter.enqueue, args=(DummyMessage(id=str(i)),)) for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert ch.basic_publish.call_count == 8
+    pika_mock.BlockingConnection.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_rabbitmq_command_bus_execute_raises_when_no_handler():
     adapter = MagicMock()
@@ -17,6 +17,13 @@ def test_redis_message_wrapper():
     m.delete()  # no-op, no error
 
 
+def test_redis_adapter_exported_lazily():
+    import command_bus.adapters as adapters
+
+    assert adapters.RedisCommandBusAdapter is RedisCommandBusAdapter
+    assert "RedisCommandBusAdapter" in adapters.__all__
+
+
 def test_redis_adapter_enqueue():
     redis_mock = MagicMock()
     adapter = RedisCommandBusAdapter(redis_client=redis_mock, queue_name="myqueue")
@@ -26,14 +33,56 @@ def test_redis_adapter_enqueue():
     assert "x" in redis_mock.lpush.call_args[0][1]
 
 
+def test_redis_adapter_enqueue_with_json_parser_round_trips():
+    from command_bus import JsonMessageParser
+
+    redis_mock = MagicMock()
+    adapter = RedisCommandBusAdapter(
+        redis_client=redis_mock, queue_name="myqueue", message_parser_class=JsonMessageParser
+    )
+    msg = DummyMessage(id="x")
+    adapter.enqueue(msg)
+    body = redis_mock.lpush.call_args[0][1]
+    assert body == JsonMessageParser.serialize(msg)
+    assert JsonMessageParser(body).initialize() == msg
+
+
 def test_redis_adapter_get_messages_nonblocking():
     redis_mock = MagicMock()
-    redis_mock.rpop.side_effect = [b"msg1", None]
+    pipe = redis_mock.pipeline.return_value
+    pipe.execute.return_value = [b"msg1", None]
     adapter = RedisCommandBusAdapter(redis_client=redis_mock, queue_name="q")
     messages = adapter.get_messages(max_messages=2, wait_seconds=0)
     assert len(messages) == 1
     assert messages[0].body == "msg1"
-    assert redis_mock.rpop.call_count == 2
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    assert pipe.rpop.call_count == 2
+    redis_mock.rpop.assert_not_called()
+
+
+def test_redis_adapter_get_messages_keeps_payloads_after_an_empty_pop():
+    redis_mock = MagicMock()
+    redis_mock.pipeline.return_value.execute.return_value = [b"msg1", None, b"msg2"]
+    adapter = RedisCommandBusAdapter(redis_client=redis_mock, queue_name="q")
+    assert [m.body for m in adapter.get_messages(max_messages=3)] == ["msg1", "msg2"]
+
+
+def test_redis_adapter_get_messages_single_rpop_skips_pipeline():
+    redis_mock = MagicMock()
+    redis_mock.rpop.return_value = b"only"
+    adapter = RedisCommandBusAdapter(redis_client=redis_mock, queue_name="q")
+    assert [m.body for m in adapter.get_messages(max_messages=1)] == ["only"]
+    redis_mock.pipeline.assert_not_called()
+
+
+def test_redis_adapter_get_messages_blocking_then_pipelined():
+    redis_mock = MagicMock()
+    redis_mock.brpop.return_value = (b"q", b"first")
+    redis_mock.pipeline.return_value.execute.return_value = ["second", "third"]
+    adapter = RedisCommandBusAdapter(redis_client=redis_mock, queue_name="q")
+    messages = adapter.get_messages(max_messages=3, wait_seconds=2)
+    assert [m.body for m in messages] == ["first", "second", "third"]
+    assert redis_mock.pipeline.return_value.rpop.call_count == 2
 
 
 def test_redis_adapter_get_messages_blocking():
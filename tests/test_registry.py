@@ -30,6 +30,15 @@ def test_get_qual_name_instance():
     assert get_qual_name(m) == "tests.test_registry.SampleMessage"
 
 
+def test_get_qual_name_is_memoized_per_class():
+    from command_bus.registry import _class_qual_name
+
+    get_qual_name(SampleMessage)
+    hits = _class_qual_name.cache_info().hits
+    assert get_qual_name(SampleMessage(value=2)) == "tests.test_registry.SampleMessage"
+    assert _class_qual_name.cache_info().hits == hits + 1
+
+
 def test_registry_register_and_get_handlers():
     registry = CommandBusRouter()
     registry.register(SampleMessage, SampleHandler)
@@ -64,6 +73,17 @@ def test_registry_entry_handler_instance():
     assert isinstance(handler, SampleHandler)
 
 
+def test_registry_entry_equality_and_validation():
+    entry = CommandBusRouterEntry(message_class=SampleMessage, handler_class=SampleHandler)
+    same = CommandBusRouterEntry(message_class=SampleMessage, handler_class=SampleHandler)
+    assert entry == same and hash(entry) == hash(same)
+    assert entry.message_qual_name == "tests.test_registry.SampleMessage"
+    with pytest.raises(AttributeError):
+        entry.message_class = SampleHandler
+    with pytest.raises(TypeError):
+        CommandBusRouterEntry(message_class="not a class", handler_class=SampleHandler)
+
+
 def test_registry_entry_is_message_match():
     entry = CommandBusRouterEntry(
         message_class=SampleMessage,
@@ -148,3 +168,208 @@ def test_registry_command_decorator_optional_and_default_params():
     assert handler.process(msg1) == "a:0:None"
     msg2 = handle(tag="b", count=2, extra="x")
     assert handler.process(msg2) == "b:2:'x'"
+
+
+def test_registry_command_decorator_passes_plain_fields_and_dumps_nested_models():
+    """Plain fields reach the function as-is (keyword-only too); model fields still arrive dumped."""
+    router = CommandBusRouter()
+    calls = []
+
+    @router.command()
+    def plain(order_id: str, *, amount: Optional[int] = None):
+        calls.append((order_id, amount))
+
+    @router.command()
+    def nested(item: SampleMessage):
+        calls.append(item)
+
+    for factory in (plain, nested):
+        entry = router.get_handlers_for_message(factory._command_message_class)[0]
+        msg = factory("o1", amount=5) if factory is plain else factory(item=SampleMessage(value=3))
+        entry.handler_instance().process(msg)
+    assert calls == [("o1", 5), {"correlation_id": None, "value": 3}]
+
+
+def test_router_indexes_entries_by_message_type():
+    class OtherMessage(CommandMessage):
+        pass
+
+    class OtherHandler(CommandHandler):
+        def process(self, message: CommandMessage):
+            return None
+
+    router = CommandBusRouter(
+        command_handlers=[
+            CommandBusRouterEntry(message_class=SampleMessage, handler_class=SampleHandler)
+        ]
+    )
+    router.register(OtherMessage, OtherHandler)
+    router.register(SampleMessage, OtherHandler)
+    assert [e.handler_class for e in router.get_handlers_for_message(SampleMessage(value=1))] == [
+        SampleHandler,
+        OtherHandler,
+    ]
+    assert [e.handler_class for e in router.get_handlers_for_message("tests.test_registry.SampleMessage")] == [
+        SampleHandler,
+        OtherHandler,
+    ]
+    assert len(router.handlers) == 3
+
+    router.deregister(OtherMessage, OtherHandler)
+    assert router.get_handlers_for_message(OtherMessage) == []
+    assert len(router.handlers) == 2
+
+
+def test_router_handlers_is_a_tuple_in_registration_order():
+    class OtherMessage(CommandMessage):
+        pass
+
+    class OtherHandler(CommandHandler):
+        def process(self, message: CommandMessage):
+            return None
+
+    router = CommandBusRouter()
+    router.register(SampleMessage, SampleHandler)
+    router.register(OtherMessage, OtherHandler)
+    router.register(SampleMessage, OtherHandler)
+    assert [(e.message_class, e.handler_class) for e in router.handlers] == [
+        (SampleMessage, SampleHandler),
+        (OtherMessage, OtherHandler),
+        (SampleMessage, OtherHandler),
+    ]
+    assert isinstance(router.handlers, tuple)
+
+
+def test_router_ignores_duplicate_registrations():
+    entry = CommandBusRouterEntry(message_class=SampleMessage, handler_class=SampleHandler)
+    router = CommandBusRouter(command_handlers=[entry, entry])
+    router.register(SampleMessage, SampleHandler)
+    assert router.handlers == (entry,)
+
+    router.deregister(SampleMessage, SampleHandler)
+    router.deregister(SampleMessage, SampleHandler)
+    assert router.handlers == ()
+    router.register(SampleMessage, SampleHandler)
+    assert router.handlers == (entry,)
+
+
+def test_router_deregister_keeps_remaining_handler_order():
+    class Second(SampleHandler):
+        pass
+
+    class Third(SampleHandler):
+        pass
+
+    router = CommandBusRouter()
+    for handler_class in (SampleHandler, Second, Third):
+        router.register(SampleMessage, handler_class)
+    router.deregister(SampleMessage, Second)
+    router.deregister(SampleMessage, Second)
+    assert [e.handler_class for e in router.get_handlers_for_message(SampleMessage)] == [SampleHandler, Third]
+    router.deregister(SampleMessage, SampleHandler)
+    router.deregister(SampleMessage, Third)
+    assert router.handlers == ()
+
+
+def test_registry_command_decorator_reuses_message_class_for_same_signature():
+    def make(router):
+        @router.command()
+        def on_ping(target: str, retries: int = 3):
+            return target
+
+        return on_ping
+
+    first = make(CommandBusRouter())._command_message_class
+    second = make(CommandBusRouter())._command_message_class
+    assert first is second
+    assert first(target="x").retries == 3
+
+    other_router = CommandBusRouter()
+
+    @other_router.command()
+    def on_ping(target: str, retries: int = 4):
+        return target
+
+    assert on_ping._command_message_class is not first
+
+    @other_router.command()
+    def with_list_default(items: list = []):  # noqa: B006 - unhashable default
+        return items
+
+    assert with_list_default().items == []
+
+
+def test_registry_command_decorator_reads_wrapped_functions_via_signature():
+    """Decorated functions (functools.wraps) get fields from the wrapped signature."""
+    import functools
+
+    def logged(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    router = CommandBusRouter()
+
+    @router.command()
+    @logged
+    def on_charge(account: str, cents: int = 100, *, note: str = "") -> str:
+        return f"{account}:{cents}:{note}"
+
+    handler = router.get_handlers_for_message(on_charge._command_message_class)[0].handler_instance()
+    assert handler.process(on_charge(account="a1")) == "a1:100:"
+    assert handler.process(on_charge(account="a2", cents=5, note="n")) == "a2:5:n"
+
+
+def test_registry_command_decorator_resolves_string_annotations():
+    router = CommandBusRouter()
+
+    @router.command()
+    def on_retry(attempt: "int", reason: "Optional[str]" = None):
+        return attempt
+
+    msg = on_retry(attempt="3")
+    assert msg.attempt == 3
+    assert msg.reason is None
+
+
+def test_registry_command_decorator_dumps_only_non_plain_fields():
+    router = CommandBusRouter()
+    calls = []
+
+    @router.command()
+    def on_batch(batch_id: str, item: SampleMessage, tags: list):
+        calls.append((batch_id, item, tags))
+
+    entry = router.get_handlers_for_message(on_batch._command_message_class)[0]
+    entry.handler_instance().process(on_batch("b1", SampleMessage(value=7), ["x"]))
+    assert calls == [("b1", {"correlation_id": None, "value": 7}, ["x"])]
+
+
+def test_registry_command_decorator_defers_schema_build_until_first_use():
+    router = CommandBusRouter()
+
+    @router.command()
+    def on_deferred(name: str, size: int = 1):
+        return name
+
+    message_class = on_deferred._command_message_class
+    assert message_class.__pydantic_complete__ is False
+    assert on_deferred(name="n").size == 1
+    assert message_class.__pydantic_complete__ is True
+
+
+def test_router_warm_up_builds_deferred_message_classes():
+    router = CommandBusRouter()
+
+    @router.command()
+    def on_warmed(name: str):
+        return name
+
+    message_class = on_warmed._command_message_class
+    assert message_class.__pydantic_complete__ is False
+    assert router.warm_up() == 1
+    assert message_class.__pydantic_complete__ is True
+    assert router.warm_up() == 0
+    assert on_warmed(name="n").name == "n"
@@ -108,10 +108,13 @@ def test_redis_response_store_mock():
     redis_mock.get.return_value = None
     store = RedisResponseStore(redis_mock, key_prefix="test:", default_ttl_seconds=30)
     store.set("k1", {"a": 1}, ttl_seconds=60)
-    redis_mock.set.assert_called_once()
-    call = redis_mock.set.call_args
+    pipe = redis_mock.pipeline.return_value
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    pipe.set.assert_called_once()
+    pipe.execute.assert_called_once()
+    call = pipe.set.call_args
     assert call[0][0] == "test:k1"
-    assert "1" in call[0][1] and "a" in call[0][1]
+    assert b"1" in call[0][1] and b"a" in call[0][1]
     assert call[1]["ex"] == 60
 
     redis_mock.get.return_value = b'{"b": 2}'
@@ -120,3 +123,413 @@ def test_redis_response_store_mock():
 
     store.delete("k3")
     redis_mock.delete.assert_called_with("test:k3")
+
+
+def test_redis_response_store_wait_blocks_on_channel():
+    """set() pushes a marker onto a per-key list that wait() BLPOPs, then GETs the value."""
+    from command_bus.adapters.response.redis import RedisResponseStore
+
+    redis_mock = MagicMock()
+    store = RedisResponseStore(redis_mock, key_prefix="test:")
+    store.set("k1", {"a": 1}, ttl_seconds=60)
+    pipe = redis_mock.pipeline.return_value
+    pipe.lpush.assert_called_once_with("test:k1:chan", b"1")
+    pipe.expire.assert_called_once_with("test:k1:chan", 60)
+
+    redis_mock.blpop.return_value = (b"test:k1:chan", b"1")
+    redis_mock.get.return_value = b'{"a": 1}'
+    assert store.wait("k1", timeout_seconds=0.25) == {"a": 1}
+    redis_mock.blpop.assert_called_with(["test:k1:chan"], timeout=0.25)
+    redis_mock.get.assert_called_with("test:k1")
+
+    redis_mock.blpop.return_value = None
+    assert store.wait("k1", timeout_seconds=2) is None
+    # Sub-millisecond timeouts are rounded up, never down to 0 (block forever)
+    store.wait("k1", timeout_seconds=0.0001)
+    redis_mock.blpop.assert_called_with(["test:k1:chan"], timeout=0.001)
+
+
+def test_redis_response_store_whole_second_timeouts_never_overshoot():
+    from command_bus.adapters.response.redis import RedisResponseStore
+
+    redis_mock = MagicMock()
+    redis_mock.get.return_value = None
+    store = RedisResponseStore(redis_mock, whole_second_timeouts=True)
+    assert store.wait("k1", timeout_seconds=2.7) is None
+    redis_mock.blpop.assert_called_once_with(["event_bus:response:k1:chan"], timeout=2)
+
+    redis_mock.get.return_value = b"5"
+    assert store.wait("k1", timeout_seconds=0.01) == 5
+    assert redis_mock.blpop.call_count == 1
+
+
+def test_redis_response_store_batches():
+    """set_many pipelines every item; get_many is one MGET."""
+    from command_bus.adapters.response.redis import RedisResponseStore
+
+    redis_mock = MagicMock()
+    store = RedisResponseStore(redis_mock, key_prefix="test:", default_ttl_seconds=30)
+    store.set_many([("k1", {"a": 1}, 60), ("k2", "two", 0)])
+    pipe = redis_mock.pipeline.return_value
+    assert [c[0][0] for c in pipe.set.call_args_list] == ["test:k1", "test:k2"]
+    assert pipe.set.call_args_list[1][1]["ex"] == 30
+    pipe.execute.assert_called_once()
+
+    redis_mock.mget.return_value = [b'{"a": 1}', None]
+    assert store.get_many(["k1", "k3"]) == [{"a": 1}, None]
+    redis_mock.mget.assert_called_once_with(["test:k1", "test:k3"])
+
+
+@pytest.mark.asyncio
+async def test_execute_and_wait_uses_blocking_wait():
+    """A store with wait() is blocked on instead of polled with get()."""
+    from command_bus.adapters.response.redis import RedisResponseStore
+
+    redis_mock = MagicMock()
+    # Nothing on the first poll; set by the time BLPOP wakes
+    redis_mock.get.side_effect = [None, b'{"price_cents": 5}']
+    redis_mock.blpop.return_value = (b"chan", b"1")
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    bus = CommandBus(
+        queue_adapter=MagicMock(),
+        command_router=registry,
+        response_store=RedisResponseStore(redis_mock),
+    )
+
+    result = await bus.execute_and_wait(GetPrice(product_id="p1"), timeout_seconds=2)
+    assert result == {"price_cents": 5}
+    assert redis_mock.get.call_count == 2
+    redis_mock.blpop.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_blocking_waits_use_a_bounded_pool_of_the_bus():
+    """More concurrent waiters than max_blocking_waits all finish; the extra ones poll."""
+    import threading
+    import time
+
+    from command_bus.adapters import InMemoryCommandBusAdapter
+    from command_bus.interfaces import ResponseStore
+
+    class BlockingStore(ResponseStore):
+        def __init__(self):
+            self._values = {}
+            self._lock = threading.Lock()
+            self.active = 0
+            self.max_active = 0
+            self.thread_names = set()
+
+        def set(self, key, value, ttl_seconds=60):
+            self._values[key] = value
+
+        def get(self, key):
+            return self._values.get(key)
+
+        def delete(self, key):
+            self._values.pop(key, None)
+
+        def wait(self, key, timeout_seconds):
+            with self._lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                self.thread_names.add(threading.current_thread().name)
+            try:
+                time.sleep(min(timeout_seconds, 0.02))
+                return self._values.get(key)
+            finally:
+                with self._lock:
+                    self.active -= 1
+
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    store = BlockingStore()
+    bus = CommandBus(
+        queue_adapter=InMemoryCommandBusAdapter(),
+        command_router=registry,
+        response_store=store,
+        max_blocking_waits=2,
+    )
+
+    async def worker():
+        while True:
+            await bus.work()
+            await asyncio.sleep(0.01)
+
+    worker_task = asyncio.create_task(worker())
+    try:
+        results = await asyncio.gather(
+            *(
+                bus.execute_and_wait(GetPrice(product_id=f"p{i}"), timeout_seconds=5, poll_interval_seconds=0.05)
+                for i in range(10)
+            )
+        )
+    finally:
+        worker_task.cancel()
+    assert [r["product_id"] for r in results] == [f"p{i}" for i in range(10)]
+    assert 1 <= store.max_active <= 2
+    assert all(name.startswith("command-bus-wait") for name in store.thread_names)
+    assert bus._blocking_waits == 0
+
+
+def test_max_blocking_waits_must_be_positive():
+    with pytest.raises(ValueError):
+        CommandBus(queue_adapter=MagicMock(), max_blocking_waits=0)
+
+
+@pytest.mark.asyncio
+async def test_execute_and_wait_wakes_on_local_dispatch():
+    """When this bus dispatches the command, the client does not wait for the next poll."""
+    from command_bus.adapters import InMemoryCommandBusAdapter
+
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    bus = CommandBus(
+        queue_adapter=InMemoryCommandBusAdapter(),
+        command_router=registry,
+        response_store=InMemoryResponseStore(),
+    )
+
+    async def worker():
+        while True:
+            await bus.work()
+            await asyncio.sleep(0.01)
+
+    worker_task = asyncio.create_task(worker())
+    try:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await bus.execute_and_wait(
+            GetPrice(product_id="p1"),
+            timeout_seconds=5,
+            poll_interval_seconds=5,
+        )
+        assert result == {"price_cents": 999, "product_id": "p1"}
+        assert loop.time() - started < 1
+        assert bus._waiters == {}
+    finally:
+        worker_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_response_store_wakes_client_on_another_bus():
+    """A client bus awaiting wait_async() gets a separate worker bus's result without polling."""
+    from command_bus.adapters import InMemoryCommandBusAdapter
+
+    adapter = InMemoryCommandBusAdapter()
+    store = InMemoryResponseStore()
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    client = CommandBus(queue_adapter=adapter, command_router=registry, response_store=store)
+    worker = CommandBus(queue_adapter=adapter, command_router=registry, response_store=store)
+
+    async def work_once():
+        await asyncio.sleep(0.05)
+        await worker.work()
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    worker_task = asyncio.create_task(work_once())
+    result = await client.execute_and_wait(
+        GetPrice(product_id="p7"), timeout_seconds=5, poll_interval_seconds=5
+    )
+    await worker_task
+    assert result == {"price_cents": 999, "product_id": "p7"}
+    assert loop.time() - started < 1
+    assert store._key_waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_response_store_wait_async_times_out():
+    store = InMemoryResponseStore()
+    assert await store.wait_async("missing", timeout_seconds=0.01) is None
+    assert store._key_waiters == {}
+    store.set("ready", 1)
+    assert await store.wait_async("ready", timeout_seconds=0.01) == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_and_wait_many_returns_results_in_order():
+    from command_bus.adapters import InMemoryCommandBusAdapter
+
+    adapter = InMemoryCommandBusAdapter()
+    store = InMemoryResponseStore()
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, response_store=store)
+
+    async def worker():
+        for _ in range(3):
+            await asyncio.sleep(0.01)
+            await bus.work()
+
+    worker_task = asyncio.create_task(worker())
+    results = await bus.execute_and_wait_many(
+        [GetPrice(product_id=p) for p in ("a", "b", "c")], timeout_seconds=2
+    )
+    await worker_task
+    assert [r["product_id"] for r in results] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_execute_and_wait_many_gives_a_repeated_instance_its_own_ids():
+    adapter = MagicMock()
+    store = MagicMock(spec=InMemoryResponseStore)
+    store.get_many.side_effect = lambda keys: [None] * len(keys)
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, response_store=store)
+
+    msg = GetPrice(product_id="x")
+    with pytest.raises(TimeoutError, match="2 of 2 commands"):
+        await bus.execute_and_wait_many([msg, msg], timeout_seconds=0.01, poll_interval_seconds=0.01)
+    first, second = adapter.enqueue_many.call_args[0][0]
+    assert first.correlation_id != second.correlation_id
+    assert msg.correlation_id is None
+
+
+@pytest.mark.asyncio
+async def test_execute_and_wait_many_polls_with_get_many_and_times_out():
+    adapter = MagicMock()
+    store = MagicMock(spec=InMemoryResponseStore)
+    store.get_many.side_effect = lambda keys: [None] * len(keys)
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, response_store=store)
+
+    with pytest.raises(TimeoutError, match="2 of 2 commands"):
+        await bus.execute_and_wait_many(
+            [GetPrice(product_id="x"), GetPrice(product_id="y")],
+            timeout_seconds=0.05,
+            poll_interval_seconds=0.01,
+        )
+    adapter.enqueue_many.assert_called_once()
+    store.get.assert_not_called()
+    assert len(store.get_many.call_args[0][0]) == 2
+
+
+def test_in_memory_response_store_sweeps_expired_entries(monkeypatch):
+    """Expired entries are reclaimed by later calls even if never read again."""
+    clock = [1000.0]
+    monkeypatch.setattr("command_bus.adapters.response.in_memory.time.monotonic", lambda: clock[0])
+    store = InMemoryResponseStore()
+    for i in range(10):
+        store.set(f"old{i}", i, ttl_seconds=1)
+    store.set("fresh", "value", ttl_seconds=60)
+
+    clock[0] += 5
+    assert store.get("fresh") == "value"
+    assert set(store._store) == {"fresh"}
+
+
+@pytest.mark.asyncio
+async def test_execute_sets_correlation_id_on_a_copy_of_the_message():
+    """The caller's command, mutable or frozen, is never given the correlation_id."""
+    from pydantic import ConfigDict
+
+    class FrozenGetPrice(CommandMessage):
+        model_config = ConfigDict(frozen=True)
+        product_id: str
+
+    adapter = MagicMock()
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    registry.register(FrozenGetPrice, PriceHandler)
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, response_store=InMemoryResponseStore())
+
+    msg = GetPrice(product_id="p1")
+    with pytest.raises(TimeoutError):
+        await bus.execute(msg, timeout_seconds=0.01, poll_interval_seconds=0.01)
+    enqueued = adapter.enqueue.call_args[0][0]
+    assert enqueued is not msg
+    assert msg.correlation_id is None
+    assert enqueued.correlation_id is not None
+    assert enqueued.product_id == "p1"
+
+    frozen = FrozenGetPrice(product_id="p2")
+    with pytest.raises(TimeoutError):
+        await bus.execute(frozen, timeout_seconds=0.01, poll_interval_seconds=0.01)
+    enqueued = adapter.enqueue.call_args[0][0]
+    assert enqueued is not frozen
+    assert frozen.correlation_id is None
+    assert enqueued.correlation_id is not None
+    assert enqueued.product_id == "p2"
+
+
+@pytest.mark.asyncio
+async def test_execute_copy_keeps_extra_fields_and_private_attributes():
+    from pydantic import ConfigDict, PrivateAttr
+
+    class LooseGetPrice(CommandMessage):
+        model_config = ConfigDict(extra="allow")
+        product_id: str
+        _trace: str = PrivateAttr(default="")
+
+    adapter = MagicMock()
+    registry = CommandBusRouter()
+    registry.register(LooseGetPrice, PriceHandler)
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, response_store=InMemoryResponseStore())
+
+    msg = LooseGetPrice(product_id="p1", region="eu")
+    msg._trace = "t-1"
+    with pytest.raises(TimeoutError):
+        await bus.execute(msg, timeout_seconds=0.01, poll_interval_seconds=0.01)
+    enqueued = adapter.enqueue.call_args[0][0]
+    assert enqueued.region == "eu"
+    assert enqueued._trace == "t-1"
+    assert enqueued.correlation_id is not None
+    assert msg.correlation_id is None
+
+
+def test_redis_response_store_serializes_models_with_model_dump_json():
+    from command_bus.adapters.response.redis import RedisResponseStore
+
+    redis_mock = MagicMock()
+    store = RedisResponseStore(redis_mock, key_prefix="test:")
+    store.set("k1", GetPrice(product_id="p1"), ttl_seconds=60)
+    payload = redis_mock.pipeline.return_value.set.call_args[0][1]
+    assert payload == GetPrice(product_id="p1").model_dump_json().encode("utf-8")
+
+
+def test_redis_response_store_payload_round_trips_as_json_bytes():
+    from decimal import Decimal
+
+    from command_bus.adapters.response.redis import RedisResponseStore
+
+    redis_mock = MagicMock()
+    store = RedisResponseStore(redis_mock, key_prefix="test:")
+    store.set("k1", {1: "one", "price": Decimal("1.50"), "nested": GetPrice(product_id="p")}, ttl_seconds=60)
+    payload = redis_mock.pipeline.return_value.set.call_args[0][1]
+    assert isinstance(payload, bytes)
+
+    redis_mock.get.return_value = payload
+    assert store.get("k1") == {
+        "1": "one",
+        "price": "1.50",
+        "nested": {"correlation_id": None, "product_id": "p"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_execute_and_wait_backs_off_from_short_polls():
+    """A result written by another process is seen well before poll_interval_seconds."""
+    adapter = MagicMock()
+    store = InMemoryResponseStore()
+    registry = CommandBusRouter()
+    registry.register(GetPrice, PriceHandler)
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, response_store=store)
+
+    async def simulate_other_worker():
+        await asyncio.sleep(0.02)
+        enqueued = adapter.enqueue.call_args[0][0]
+        # Written to the store directly, so the local waiter is never woken
+        store.set(enqueued.correlation_id, {"price_cents": 1}, ttl_seconds=60)
+
+    worker = asyncio.create_task(simulate_other_worker())
+    start = asyncio.get_running_loop().time()
+    result = await bus.execute_and_wait(
+        GetPrice(product_id="p1"), timeout_seconds=5, poll_interval_seconds=2
+    )
+    await worker
+    assert result == {"price_cents": 1}
+    assert asyncio.get_running_loop().time() - start < 1
@@ -0,0 +1,64 @@
+"""Tests for SQLite response store."""
+
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from command_bus import CommandMessage
+from command_bus.adapters import SqliteResponseStore
+
+
+class Quote(CommandMessage):
+    price: int
+
+
+def test_sqlite_response_store_set_get_delete():
+    with TemporaryDirectory() as tmpdir:
+        store = SqliteResponseStore(database=Path(tmpdir) / "responses.db")
+        store.set("key1", {"test": "value"}, ttl_seconds=60)
+        store.set("key2", "simple string", ttl_seconds=60)
+        store.set("key3", Quote(price=5), ttl_seconds=60)
+        assert store.get("key1") == {"test": "value"}
+        assert store.get("key2") == "simple string"
+        assert store.get("key3") == {"correlation_id": None, "price": 5}
+
+        store.set("key1", 42, ttl_seconds=60)
+        assert store.get("key1") == 42
+        store.delete("key1")
+        assert store.get("key1") is None
+        assert store.get("missing") is None
+        store.close()
+
+
+def test_sqlite_response_store_ttl_expiry_and_default_ttl():
+    with TemporaryDirectory() as tmpdir:
+        store = SqliteResponseStore(database=Path(tmpdir) / "responses.db", default_ttl_seconds=60)
+        store.set("short", "v", ttl_seconds=0.1)
+        store.set("default", "v", ttl_seconds=0)
+        time.sleep(0.2)
+        assert store.get("short") is None
+        assert store.get("default") == "v"
+        assert store.get_many(["short", "default"]) == [None, "v"]
+
+
+def test_sqlite_response_store_persists_across_instances():
+    with TemporaryDirectory() as tmpdir:
+        db = Path(tmpdir) / "nested" / "responses.db"
+        writer = SqliteResponseStore(database=db)
+        writer.set_many([("a", 1, 60), ("b", [1, 2], 60)])
+        reader = SqliteResponseStore(database=db)
+        assert reader.get_many(["b", "missing", "a"]) == [[1, 2], None, 1]
+        writer.close()
+        reader.close()
+
+
+def test_sqlite_response_store_purges_expired_rows(monkeypatch):
+    with TemporaryDirectory() as tmpdir:
+        store = SqliteResponseStore(database=Path(tmpdir) / "responses.db")
+        monkeypatch.setattr(SqliteResponseStore, "PURGE_INTERVAL", 3)
+        store.set("old", "v", ttl_seconds=0.05)
+        time.sleep(0.1)
+        store.set("x", 1)
+        store.set("y", 2)
+        (count,) = store._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        assert count == 2
@@ -3,7 +3,7 @@
 from unittest.mock import MagicMock
 
 import pytest
-from command_bus import CommandBus, CommandBusRouter, CommandMessage
+from command_bus import CommandBus, CommandBusRouter, CommandHandler, CommandMessage
 from command_bus.adapters import SqsCommandBusAdapter
 from command_bus.parsers import JsonMessageParser, ReprMessageParser
 
@@ -90,3 +90,109 @@ def test_sqs_command_bus_message_parser_class():
 
     bus_default = CommandBus(queue_adapter=adapter, command_router=registry)
     assert bus_default.message_parser_class is ReprMessageParser
+
+
+def test_sqs_adapter_dequeue_batch_uses_delete_message_batch():
+    """Batches are deleted 10 at a time by receipt handle."""
+    queue = MagicMock()
+    client = MagicMock()
+    client.get_queue_by_name.return_value = queue
+    adapter = SqsCommandBusAdapter(queue_name="test", sqs_client=client)
+
+    handles = [MagicMock(receipt_handle=f"rh{i}") for i in range(12)]
+    adapter.dequeue_batch(handles)
+    assert queue.delete_messages.call_count == 2
+    first, second = (c.kwargs["Entries"] for c in queue.delete_messages.call_args_list)
+    assert [e["ReceiptHandle"] for e in first] == [f"rh{i}" for i in range(10)]
+    assert [e["ReceiptHandle"] for e in second] == ["rh10", "rh11"]
+    assert len({e["Id"] for e in first}) == 10
+    for handle in handles:
+        handle.delete.assert_not_called()
+
+
+def test_sqs_adapter_dequeue_batch_retries_failed_entries_alone(caplog):
+    """Entries a DeleteMessageBatch reports as Failed are logged and deleted one by one."""
+    queue = MagicMock()
+    queue.delete_messages.side_effect = [
+        {"Successful": [{"Id": str(i)} for i in range(10) if i != 3], "Failed": [{"Id": "3", "Code": "InternalError", "Message": "try again"}]},
+        {"Successful": [{"Id": "0"}], "Failed": []},
+    ]
+    client = MagicMock()
+    client.get_queue_by_name.return_value = queue
+    adapter = SqsCommandBusAdapter(queue_name="test", sqs_client=client)
+
+    handles = [MagicMock(receipt_handle=f"rh{i}") for i in range(11)]
+    with caplog.at_level("WARNING", logger="command_bus.adapters.queue.sqs"):
+        adapter.dequeue_batch(handles)
+    assert "InternalError" in caplog.text
+    handles[3].delete.assert_called_once()
+    assert sum(h.delete.call_count for h in handles) == 1
+
+    # Still refused: raises like dequeue() does
+    queue.delete_messages.side_effect = None
+    queue.delete_messages.return_value = {"Failed": [{"Id": "0", "Code": "ReceiptHandleIsInvalid", "Message": "gone"}]}
+    stale = MagicMock(receipt_handle="old")
+    stale.delete.side_effect = RuntimeError("ReceiptHandleIsInvalid")
+    with pytest.raises(RuntimeError, match="ReceiptHandleIsInvalid"):
+        adapter.dequeue_batch([stale])
+
+
+def test_sqs_adapter_get_messages_checks_max_messages():
+    client = MagicMock()
+    adapter = SqsCommandBusAdapter(queue_name="test", sqs_client=client)
+    for bad in (0, -1, 11):
+        with pytest.raises(ValueError, match="max_messages"):
+            adapter.get_messages(max_messages=bad)
+    client.get_queue_by_name.return_value.receive_messages.assert_not_called()
+
+
+def test_bus_rejects_max_concurrency_below_one():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        CommandBus(queue_adapter=MagicMock(), max_concurrency=0)
+
+
+def test_sqs_adapter_enqueue_many_uses_send_message_batch():
+    queue = MagicMock()
+    queue.send_messages.return_value = {"Successful": [], "Failed": []}
+    client = MagicMock()
+    client.get_queue_by_name.return_value = queue
+    adapter = SqsCommandBusAdapter(queue_name="test", sqs_client=client)
+
+    msgs = [DummyMessage(id=str(i)) for i in range(11)]
+    adapter.enqueue_many(msgs, delay_seconds=3)
+    assert queue.send_messages.call_count == 2
+    first, second = (c.kwargs["Entries"] for c in queue.send_messages.call_args_list)
+    assert [e["MessageBody"] for e in first + second] == [str(m) for m in msgs]
+    assert {e["DelaySeconds"] for e in first + second} == {3}
+    assert len({e["Id"] for e in first}) == 10
+    queue.send_message.assert_not_called()
+
+    queue.send_messages.return_value = {"Failed": [{"Id": "0", "Code": "Throttled", "Message": "slow down"}]}
+    with pytest.raises(RuntimeError, match="Throttled"):
+        adapter.enqueue_many([msgs[0]])
+
+
+@pytest.mark.asyncio
+async def test_work_dispatches_batch_and_acks_successful_messages():
+    """work() dispatches a received batch and acknowledges only the messages that succeeded."""
+    received = []
+
+    class FailingOnBadHandler(CommandHandler):
+        async def process(self, message):
+            if message.id == "bad":
+                raise RuntimeError("handler failed")
+            received.append(message.id)
+
+    registry = CommandBusRouter()
+    registry.register(DummyMessage, FailingOnBadHandler)
+    messages = [
+        MagicMock(body=str(DummyMessage(id=i))) for i in ("a", "bad", "b")
+    ]
+    adapter = MagicMock(spec=SqsCommandBusAdapter)
+    adapter.get_messages.return_value = messages
+    bus = CommandBus(queue_adapter=adapter, command_router=registry, max_concurrency=2)
+
+    with pytest.raises(RuntimeError, match="handler failed"):
+        await bus.work()
+    assert sorted(received) == ["a", "b"]
+    adapter.dequeue_batch.assert_called_once_with([messages[0], messages[2]])